@@ -16,8 +16,13 @@ Optional:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
+import bisect
+import ctypes
 import json
 import os
+import random
 import re
 import sys
 import tempfile
@@ -28,14 +33,19 @@ import logging
 import threading
 import warnings
 import gc
-from concurrent.futures import ThreadPoolExecutor
+import functools
+import itertools
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Dict, Any, Optional
+from typing import List, Tuple, Dict, Any, Callable, Iterable, Optional, Sequence
 import urllib.request
 import urllib.parse
 
+import numpy as np
 from rapidfuzz import fuzz
+from rapidfuzz.process import cdist
 from unidecode import unidecode
 
 try:
@@ -46,6 +56,14 @@ try:
     import whisperx  # type: ignore
 except Exception:
     whisperx = None
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+try:
+    import pynvml  # type: ignore
+except Exception:
+    pynvml = None
 
 AUDIO_EXTS = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac"}
 SENT_SPLIT_RE = re.compile(r"(?<=[.!?…])(?:\s+|(?=[«\"'“”A-Za-zА-ЯЁ]))")
@@ -54,27 +72,61 @@ TEXT_PART_RETRY_THRESHOLD = 5  # ??????????? ???????? ??? ???????????? ?????????
 MIN_MATCH_MS = 200  # защита от нулевых/почти нулевых совпадений (200 мс)
 RECOVER_LOOKAHEAD_SENTENCES = 8  # fallback: try to resume alignment a few sentences ahead
 MAX_EXTRA_TOKENS = 6  # ограничение на расширение окна матчинга
+FLUSH_INTERVAL_SEC = 2.0  # min gap between mid-file progress saves; file end/exit always save
 
 WORD_RE = re.compile(r"[\w\-']+", re.UNICODE)
 _num_chunk = re.compile(r"(\d+)")
 _COMPACT_RE = re.compile(r"[^0-9a-z]+")
+_WS_RE = re.compile(r"\s+")
+_BRACKET_TAG_RE = re.compile(r"\[[^][]*\]")
+_HSPACE_RE = re.compile(r"[ \t\f\v]+")
+_ELLIPSIS_RUN_RE = re.compile(r"\.{4,}")
+
+
+def _collapse_ws(s: str) -> str:
+    """Same as _WS_RE.sub(" ", s).strip() (str.split uses the same whitespace set as \\s)."""
+    return " ".join(s.split())
 
 # Optional log redirection: default stdout; set TRANSCRIBE_LOG_TARGET=stderr or path.
 _LOG_TARGET = (os.environ.get("TRANSCRIBE_LOG_TARGET") or "stdout").strip()
 _LOG_FILE_HANDLE = None
+# The streams we were started with. _suppress_asr_noise points sys.stdout/sys.stderr at
+# devnull for the whole process while an ASR/align job runs on a worker thread, and one
+# usually is; our own log and the final verdict always go to these.
+_REAL_STDOUT = sys.stdout
+_REAL_STDERR = sys.stderr
+
+def _env_float(name: str) -> Optional[float]:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+# Max seconds per VAD-merged segment that WhisperX batch-decodes (its own default: 30).
+# Lower values give more, shorter segments per batch; unset keeps the library default.
+_ASR_CHUNK_SEC = _env_float("TRANSCRIBE_CHUNK_SEC")
+
+# TRANSCRIBE_TRUST_ASR_DURATION=1 takes a file's length from the decoded waveform
+# (sample count) instead of probing the container with ffprobe per file. Container
+# durations can differ by a few ms (encoder delay/padding), which shifts the offsets
+# of every later file, so the probe stays the default.
+_TRUST_ASR_DURATION = (os.environ.get("TRANSCRIBE_TRUST_ASR_DURATION") or "0").strip().lower() not in ("0", "false", "no", "off")
 
 def _log_stream():
     global _LOG_FILE_HANDLE
     target_norm = _LOG_TARGET.lower()
     if target_norm == "stdout":
-        return sys.stdout
+        return _REAL_STDOUT
     if target_norm in ("", "stderr"):
-        return sys.stderr
+        return _REAL_STDERR
     if _LOG_FILE_HANDLE is None:
         try:
             _LOG_FILE_HANDLE = open(_LOG_TARGET, "a", encoding="utf-8")
         except Exception:
-            _LOG_FILE_HANDLE = sys.stderr
+            _LOG_FILE_HANDLE = _REAL_STDERR
     return _LOG_FILE_HANDLE
 
 # --- small stderr logger ---
@@ -87,68 +139,142 @@ def eprint(*a, **k):
         try:
             stream.write(msg + "\n")
         except Exception:
-            sys.stderr.write(msg + "\n")
+            _REAL_STDERR.write(msg + "\n")
 
 # --- strict final line ---
 def final_log(success: bool) -> None:
     """Print only 'true' or 'false' as the very last line and exit immediately."""
     msg = "true\n" if success else "false\n"
     try:
-        sys.stdout.write(msg)
-        sys.stdout.flush()
+        _REAL_STDOUT.write(msg)
+        _REAL_STDOUT.flush()
     except Exception:
         pass
     try:
-        if sys.stderr is not sys.stdout:
-            sys.stderr.write(msg)
-            sys.stderr.flush()
+        if _REAL_STDERR is not _REAL_STDOUT:
+            _REAL_STDERR.write(msg)
+            _REAL_STDERR.flush()
     except Exception:
         pass
     os._exit(0)
 
 _SCRIPT_START = time.time()
 _TIME_SPENT_BASE = 0.0
-_SAVE_ITEMS_CACHE: Dict[str, List[Dict[str, Any]]] = {}
+# out_path -> per item position, (stripped text, start_ms, end_ms, audio_file) of the
+# last saved timing, or None for untimed/empty items: all a later save reuses from it
+_SavedTiming = Optional[Tuple[str, Any, Any, Any]]
+_SAVE_ITEMS_CACHE: Dict[str, List[_SavedTiming]] = {}
+# out_path -> per item position, (signature, sentence tokens list, saved timing, end_ms,
+# audio_file, rendered item JSON as on-disk bytes) from the last save. The tokens list is
+# the sentence's own (it pins the id in the signature); dropped on the final save.
+_ItemRender = Tuple[Tuple[Any, ...], Any, _SavedTiming, Any, Any, bytes]
+_ITEM_JSON_CACHE: Dict[str, List[Optional[_ItemRender]]] = {}
+
+
+def _saved_timing(item: Any) -> _SavedTiming:
+    if not isinstance(item, dict):
+        return None
+    text = (item.get("text") or "").strip()
+    st = item.get("start_ms")
+    if not text or st is None:
+        return None
+    return (text, st, item.get("end_ms"), item.get("audio_file"))
+
+# orjson (when installed) parses/serializes big transcripts several times faster.
+# Its output is not byte-identical to json.dumps: NaN/Infinity become null and some
+# floats are spelled differently (1e-5 vs 1e-05), so every value written to a progress
+# file goes through _json_dumps to keep one file on one serializer.
+def _json_load_path(path: Path) -> Any:
+    return _json_load_bytes(path.read_bytes())
+
+def _json_load_bytes(raw: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity, >64-bit ints etc.: stdlib accepts (or rejects) them as before
+    return json.loads(raw.decode("utf-8"))
+
+# str(path) -> (st_mtime_ns, st_size, bytes) of the last read of a progress file.
+# Raw bytes rather than the parsed tree: callers mutate what they load, and a
+# deepcopy of a big transcript costs more than re-parsing it with orjson.
+_EXISTING_CACHE: Dict[str, Tuple[int, int, bytes]] = {}
+
+def _read_progress_bytes(path: Path) -> Optional[bytes]:
+    """File contents, or None if missing; re-read only when mtime/size changed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = str(path)
+    cached = _EXISTING_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    raw = path.read_bytes()
+    _EXISTING_CACHE[key] = (st.st_mtime_ns, st.st_size, raw)
+    return raw
+
+def _json_dumps(obj: Any, pretty: bool = False) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode("utf-8")
+        except TypeError:
+            pass  # non-native types / huge ints: let stdlib handle (or raise) as before
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
 
-def _load_existing_items(out_path: Path) -> Optional[List[Dict[str, Any]]]:
+def _load_existing_items(out_path: Path) -> Optional[List[_SavedTiming]]:
     key = str(out_path)
     if key in _SAVE_ITEMS_CACHE:
         return _SAVE_ITEMS_CACHE[key]
-    if not out_path.exists():
-        return None
     try:
-        with out_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        raw = _read_progress_bytes(out_path)
+        if raw is None:
+            return None
+        data = _json_load_bytes(raw)
         items = data.get("items")
         if isinstance(items, list):
-            _SAVE_ITEMS_CACHE[key] = items
-            return items
+            timings = [_saved_timing(it) for it in items]
+            _SAVE_ITEMS_CACHE[key] = timings
+            return timings
     except Exception:
         return None
     return None
 
 def finish(success: bool) -> None:
+    _wait_pending_write()
+    if _WRITE_FAILED:
+        success = False
     elapsed = max(0.0, time.time() - _SCRIPT_START)
     eprint(f"[time] elapsed {elapsed:.1f}s")
     final_log(success)
 
 # --- text utils ---
+# The same sentences/tokens get normalized again on every alignment pass and
+# resume, so the pure string helpers below are memoized.
+@functools.lru_cache(maxsize=200_000)
 def norm_text(s: str) -> str:
     s = unidecode(s.lower().strip())
-    return re.sub(r"\s+", " ", s)
+    return _WS_RE.sub(" ", s)
+
+@functools.lru_cache(maxsize=200_000)
+def _tokenize_cached(s: str) -> Tuple[str, ...]:
+    return tuple(m.group(0).lower() for m in WORD_RE.finditer(unidecode(s)))
 
 def tokenize_words(s: str) -> List[str]:
-    return [m.group(0).lower() for m in WORD_RE.finditer(unidecode(s))]
+    return list(_tokenize_cached(s))
 
+@functools.lru_cache(maxsize=200_000)
 def _compact_for_match(s: str) -> str:
     if not s:
         return ""
     return _COMPACT_RE.sub("", s.lower())
 
-def _compact_token_eq(a: str, b: str) -> bool:
-    if not a or not b:
-        return False
-    return _compact_for_match(a) == _compact_for_match(b)
+@functools.lru_cache(maxsize=200_000)
+def _norm_word(s: str) -> str:
+    # ASR word -> aligner token; spoken vocabularies repeat heavily, so this is mostly cache hits
+    return unidecode(s.lower())
 
 # -------- case-insensitive dir helpers --------
 def _find_subdir_case_insensitive(parent: Path, name: str) -> Optional[Path]:
@@ -164,8 +290,9 @@ def _video_roots(main: Path, channel: str, video: str) -> List[Path]:
     return [main / channel / "VIDEOS" / video, main / channel / video]
 
 # -------- natural sort --------
-def natural_key(s: str):
-    return [int(t) if t.isdigit() else t.lower() for t in _num_chunk.split(s)]
+@functools.lru_cache(maxsize=8192)
+def natural_key(s: str) -> Tuple[Any, ...]:
+    return tuple(int(t) if t.isdigit() else t.lower() for t in _num_chunk.split(s))
 
 # -------- input discovery --------
 @dataclass
@@ -177,13 +304,41 @@ def scan_audio(main: Path, channel: str, video: str) -> List[AudioItem]:
     for base in _video_roots(main, channel, video):
         ad = _find_subdir_case_insensitive(base, "VOICE")
         if not ad: continue
-        for p in ad.iterdir():
-            if p.is_file() and p.suffix.lower() in AUDIO_EXTS:
-                files.append(p)
+        with os.scandir(ad) as it:
+            for e in it:
+                if os.path.splitext(e.name)[1].lower() in AUDIO_EXTS and e.is_file():
+                    files.append(Path(e.path))
     files.sort(key=lambda q: natural_key(q.name))
     return [AudioItem(p) for p in files]
 
 # -------- TEXTS --------
+# matched against already-lowercased stems, so no IGNORECASE needed
+_COPY_SUFFIX_RE = re.compile(r"[\s._-]*(copy|копия)(?:\s*\(\d+\)|\s*\d+)?$")
+
+@functools.lru_cache(maxsize=8192)
+def _canonical_stem(stem: str) -> str:
+    return _COPY_SUFFIX_RE.sub("", stem.lower().strip()).strip()
+
+def _has_copy_marker(stem: str) -> bool:
+    return _COPY_SUFFIX_RE.search(stem.strip().lower()) is not None
+
+def _batched_read(paths: Sequence[Path], max_workers: int = 16) -> List[bytes]:
+    """Read whole files concurrently; results keep the order of `paths`."""
+    if not paths:
+        return []
+    if len(paths) == 1:
+        return [paths[0].read_bytes()]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as ex:
+        return list(ex.map(Path.read_bytes, paths))
+
+def _decode_text(data: bytes) -> str:
+    # same result as read_text(): utf-8 (cp1251 fallback) with universal newlines
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("cp1251", errors="ignore")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
 def scan_texts(mainFolderPath: Path,
                channelName: str,
                videoFolderName: str,
@@ -204,36 +359,28 @@ def scan_texts(mainFolderPath: Path,
         if not d or not d.exists():
             return []
         files = []
-        for p in d.iterdir():
-            if not p.is_file() or p.suffix.lower() not in ALLOWED:
-                continue
-            if p.stem.lower().endswith("_snapshot"):
-                continue
-            files.append(p)
+        with os.scandir(d) as it:
+            for e in it:
+                stem, ext = os.path.splitext(e.name)
+                if ext.lower() not in ALLOWED or stem.lower().endswith("_snapshot"):
+                    continue
+                if not e.is_file():
+                    continue
+                files.append(Path(e.path))
         return sorted(files, key=lambda p: natural_key(p.name))
 
-    copy_suffix_re = re.compile(r"[\s._-]*(copy|копия)(?:\s*\(\d+\)|\s*\d+)?$", re.IGNORECASE)
-
-    def _canonical_stem(stem: str) -> str:
-        s = stem.strip().lower()
-        s = copy_suffix_re.sub("", s).strip()
-        return s
-
-    def _has_copy_marker(stem: str) -> bool:
-        return copy_suffix_re.search(stem.strip().lower()) is not None
-
     def _pick_preferred(candidates: List[Path]) -> Path:
         ext_rank = {".txt": 3, ".srt": 2, ".vtt": 1}
-        return sorted(
-            candidates,
-            key=lambda p: (
-                int(p.stat().st_mtime_ns) if p.exists() else 0,
-                int(p.stat().st_size) if p.exists() else 0,
-                ext_rank.get(p.suffix.lower(), 0),
-                p.name.lower(),
-            ),
-            reverse=True,
-        )[0]
+
+        def _rank(p: Path):
+            try:
+                st = p.stat()  # one syscall for both mtime and size
+                mtime, size = int(st.st_mtime_ns), int(st.st_size)
+            except OSError:
+                mtime, size = 0, 0
+            return (mtime, size, ext_rank.get(p.suffix.lower(), 0), p.name.lower())
+
+        return max(candidates, key=_rank)
 
     roots: List[Path] = [
         Path(mainFolderPath) / channelName / videoFolderName,
@@ -310,17 +457,17 @@ def scan_texts(mainFolderPath: Path,
 
     eprint(f"[texts] found {len(selected_paths)} file(s): " + ", ".join(p.name for p in selected_paths))
 
-    blocks: List[str] = []
-    for p in selected_paths:
-        try:
-            blocks.append(p.read_text(encoding="utf-8"))
-        except Exception:
-            blocks.append(p.read_text(encoding="cp1251", errors="ignore"))
-    return blocks
+    if not selected_paths:
+        return []
+    return [_decode_text(data) for data in _batched_read(selected_paths)]
 
 # ---------- План-сегментация "как в JS": splitBalanced ----------
 
 _RX_SENT_END = re.compile(r'([.!?…]+[)"»\]]*\s)')
+# only match extents are used, so the groups are non-capturing
+_PARA_SPLIT_RE = re.compile(r"\n\s*\n")
+_PARA_SENT_END_RE = re.compile(r'[.!?…]+[)"»\]]*(?:\s+|$)')
+_BREAK_SENT_END_RE = re.compile(r'[.!?…]+[)"»\]]?\s')
 _TAG_START = "["
 _TAG_END = "]"
 
@@ -354,11 +501,15 @@ def _mask_tags(text: str) -> str:
     spans = _iter_tag_spans(text)
     if not spans:
         return text
-    chars = list(text)
+    # spans are sorted and disjoint: copy the gaps, emit one run of "a" per tag
+    pieces: List[str] = []
+    prev = 0
     for start, end in spans:
-        for i in range(start, end):
-            chars[i] = "a"
-    return "".join(chars)
+        pieces.append(text[prev:start])
+        pieces.append("a" * (end - start))
+        prev = end
+    pieces.append(text[prev:])
+    return "".join(pieces)
 
 def _adjust_break_index(idx: int, spans: List[Tuple[int, int]]) -> int:
     """Move break index out of a tag span if it falls inside one."""
@@ -397,15 +548,14 @@ def _find_break(remaining: str, limit: int) -> int:
 
 def _split_into_sentences_with_paras(source: str) -> List[str]:
     out: List[str] = []
-    paras = re.split(r'\n\s*\n', source)
+    paras = _PARA_SPLIT_RE.split(source)
     for p_idx, p in enumerate(paras):
         p = (p or '').strip()
         if not p:
             continue
         i = 0
-        rx = re.compile(r'([.!?…]+[)"»\]]*)(\s+|$)')
         masked = _mask_tags(p)
-        for m in rx.finditer(masked):
+        for m in _PARA_SENT_END_RE.finditer(masked):
             end = m.end()
             sent = p[i:end]
             if sent.strip():
@@ -448,20 +598,13 @@ def split_balanced(source: str, limit: int) -> List[str]:
 
     # 2) префиксные длины
     n = len(sents)
-    pref = [0] * (n + 1)
-    for i in range(n):
-        pref[i + 1] = pref[i] + len(sents[i])
-
-    def chunk_cost(i: int, j: int) -> float:
-        length = pref[j] - pref[i]
-        if length > limit:
-            return float('inf')
-        slack = limit - length
-        return float(slack * slack)
-
-    # 4) DP
-    best = [float('inf')] * (n + 1)
-    next_break = [-1] * (n + 1)
+    pref = np.zeros(n + 1, dtype=np.int64)
+    if n:
+        np.cumsum([len(s) for s in sents], out=pref[1:])
+
+    # 4) DP: for each i score every feasible end j in one vector op
+    best = np.full(n + 1, np.inf)
+    next_break = np.full(n + 1, -1, dtype=np.int64)
     best[n] = 0.0
 
     for i in range(n - 1, -1, -1):
@@ -469,22 +612,24 @@ def split_balanced(source: str, limit: int) -> List[str]:
             best[i] = best[i + 1]
             next_break[i] = i + 1
             continue
-        j = i + 1
-        while j <= n and (pref[j] - pref[i]) <= limit:
-            cost = chunk_cost(i, j) + best[j]
-            if cost < best[i]:
-                best[i] = cost
-                next_break[i] = j
-            j += 1
+        j_max = int(np.searchsorted(pref, pref[i] + limit, side='right')) - 1
+        if j_max <= i:
+            continue
+        slack = limit - (pref[i + 1:j_max + 1] - pref[i])
+        costs = (slack * slack).astype(np.float64) + best[i + 1:j_max + 1]
+        k = int(costs.argmin())  # first minimum -> shortest chunk on ties, as before
+        if costs[k] < np.inf:
+            best[i] = costs[k]
+            next_break[i] = i + 1 + k
 
     # 5) восстановление
     chunks: List[str] = []
     i = 0
     while i < n:
-        j = next_break[i]
+        j = int(next_break[i])
         if j == -1 or j <= i:
             j = min(n, i + 1)
-        text = "".join(sents[i:j]).trim() if hasattr(str, "trim") else "".join(sents[i:j]).strip()
+        text = "".join(sents[i:j]).strip()
         if text:
             chunks.append(text)
         i = j
@@ -498,9 +643,52 @@ class Word:
     start: float
     end: float
 
+
+@dataclass
+class Words:
+    """ASR word timeline as parallel columns (seconds); iterate to get `Word` views."""
+    text: List[str]
+    start: np.ndarray
+    end: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "Words":
+        return cls([], np.empty(0), np.empty(0))
+
+    @classmethod
+    def from_iter(cls, words: Iterable[Word]) -> "Words":
+        words = list(words)
+        return cls([w.text for w in words],
+                   np.array([w.start for w in words], dtype=float),
+                   np.array([w.end for w in words], dtype=float))
+
+    @classmethod
+    def concat(cls, parts: Sequence["Words"]) -> "Words":
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        return cls([t for p in parts for t in p.text],
+                   np.concatenate([p.start for p in parts]),
+                   np.concatenate([p.end for p in parts]))
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __iter__(self):
+        return map(Word, self.text, self.start.tolist(), self.end.tolist())
+
+    def shifted(self, offset: float) -> "Words":
+        return Words(self.text, self.start + offset, self.end + offset)
+
+    def monotonic(self) -> "Words":
+        """Clamp starts to be non-decreasing and ends to never precede their start."""
+        start = np.maximum.accumulate(self.start) if len(self.start) else self.start
+        return Words(self.text, start, np.maximum(self.end, start))
+
 # Silence third-party spam during ASR (thread-safe, re-entrant).
 _ASR_SUPPRESS_LOCK = threading.RLock()
 _ASR_SUPPRESS_STATE = {
+    "installed": False,
     "depth": 0,
     "old_filters": None,
     "old_levels": None,
@@ -521,16 +709,42 @@ _ASR_SUPPRESS_WARNING_PATTERNS = [
 ]
 
 
-def _wait_for_min_vram(min_bytes: int, poll_interval: float = 0.5, timeout: float = 60.0):
+_NVML_HANDLE: Any = None  # False once NVML turned out to be unusable
+
+
+def _nvml_free_bytes() -> Optional[int]:
+    """Free VRAM of torch's current device via NVML (no CUDA context sync); None if unavailable."""
+    global _NVML_HANDLE
+    if pynvml is None or _NVML_HANDLE is False:
+        return None
+    try:
+        if _NVML_HANDLE is None:
+            pynvml.nvmlInit()
+            # match by PCI address: NVML ignores CUDA_VISIBLE_DEVICES ordering
+            props = torch.cuda.get_device_properties(torch.cuda.current_device())
+            bus_id = f"{props.pci_domain_id:08X}:{props.pci_bus_id:02X}:{props.pci_device_id:02X}.0"
+            _NVML_HANDLE = pynvml.nvmlDeviceGetHandleByPciBusId(bus_id)
+        return int(pynvml.nvmlDeviceGetMemoryInfo(_NVML_HANDLE).free)
+    except Exception:
+        _NVML_HANDLE = False
+        return None
+
+
+def _wait_for_min_vram(min_bytes: int, poll_interval: float = 0.1, max_interval: float = 2.0,
+                       timeout: float = 60.0):
     if min_bytes <= 0 or torch is None or not torch.cuda.is_available():
         return
     start = time.time()
     warned = False
+    emptied = False
+    interval = poll_interval
     while True:
-        try:
-            free, total = torch.cuda.mem_get_info()
-        except Exception:
-            return
+        free = _nvml_free_bytes()
+        if free is None:
+            try:
+                free, total = torch.cuda.mem_get_info()
+            except Exception:
+                return
         if free >= min_bytes:
             return
         if not warned:
@@ -538,13 +752,17 @@ def _wait_for_min_vram(min_bytes: int, poll_interval: float = 0.5, timeout: floa
             free_gb = free / (1024 ** 3)
             eprint(f"[vram] waiting for {need_gb:.1f}GB free (currently {free_gb:.1f}GB)")
             warned = True
-        try:
-            torch.cuda.empty_cache()
-        except Exception:
-            pass
+        if not emptied:
+            # empty_cache syncs the device; our own cached blocks only need releasing once
+            try:
+                torch.cuda.empty_cache()
+            except Exception:
+                pass
+            emptied = True
         if timeout and (time.time() - start) > timeout:
             return
-        time.sleep(poll_interval)
+        time.sleep(interval)
+        interval = min(interval * 1.5, max_interval)
 
 
 def _clear_cuda_cache():
@@ -562,21 +780,45 @@ def _clear_cuda_cache():
             pass
 
 
+def _install_asr_silence() -> None:
+    """Add the known-noise warning filters once per process (restored at exit)."""
+    if _ASR_SUPPRESS_STATE["installed"]:
+        return
+    _ASR_SUPPRESS_STATE["old_filters"] = warnings.filters[:]
+    for pattern in _ASR_SUPPRESS_WARNING_PATTERNS:
+        warnings.filterwarnings("ignore", message=pattern)
+    _ASR_SUPPRESS_STATE["installed"] = True
+    atexit.register(_restore_asr_silence)
+
+
+def _restore_asr_silence() -> None:
+    with _ASR_SUPPRESS_LOCK:
+        if not _ASR_SUPPRESS_STATE["installed"]:
+            return
+        warnings.filters[:] = _ASR_SUPPRESS_STATE["old_filters"]
+        _ASR_SUPPRESS_STATE["installed"] = False
+        if _ASR_SUPPRESS_STATE["depth"] == 0 and _ASR_SUPPRESS_STATE.get("devnull") is not None:
+            try:
+                _ASR_SUPPRESS_STATE["devnull"].close()
+            except Exception:
+                pass
+            _ASR_SUPPRESS_STATE["devnull"] = None
+
+
 @contextlib.contextmanager
 def _suppress_asr_noise():
+    # The pattern filters stay installed after the first call; logger levels and the
+    # stdout/stderr swap are scoped, since our own log goes through sys.stdout as well.
     with _ASR_SUPPRESS_LOCK:
+        _install_asr_silence()
         if _ASR_SUPPRESS_STATE["depth"] == 0:
-            _ASR_SUPPRESS_STATE["old_filters"] = warnings.filters[:]
             _ASR_SUPPRESS_STATE["old_levels"] = {
                 name: logging.getLogger(name).level for name in _ASR_SUPPRESS_TARGETS
             }
-            _ASR_SUPPRESS_STATE["old_stdout"] = sys.stdout
-            _ASR_SUPPRESS_STATE["old_stderr"] = sys.stderr
-            warnings.simplefilter("ignore")
-            for pattern in _ASR_SUPPRESS_WARNING_PATTERNS:
-                warnings.filterwarnings("ignore", message=pattern)
             for name in _ASR_SUPPRESS_TARGETS:
                 logging.getLogger(name).setLevel(logging.ERROR)
+            _ASR_SUPPRESS_STATE["old_stdout"] = sys.stdout
+            _ASR_SUPPRESS_STATE["old_stderr"] = sys.stderr
             try:
                 if _ASR_SUPPRESS_STATE["devnull"] is None:
                     _ASR_SUPPRESS_STATE["devnull"] = open(os.devnull, "w")
@@ -592,7 +834,6 @@ def _suppress_asr_noise():
         with _ASR_SUPPRESS_LOCK:
             _ASR_SUPPRESS_STATE["depth"] -= 1
             if _ASR_SUPPRESS_STATE["depth"] == 0:
-                warnings.filters[:] = _ASR_SUPPRESS_STATE["old_filters"]
                 for name, level in (_ASR_SUPPRESS_STATE["old_levels"] or {}).items():
                     logging.getLogger(name).setLevel(level)
                 try:
@@ -602,80 +843,162 @@ def _suppress_asr_noise():
                         sys.stderr = _ASR_SUPPRESS_STATE["old_stderr"]  # type: ignore
                 except Exception:
                     pass
-                if _ASR_SUPPRESS_STATE.get("devnull") is not None:
-                    try:
-                        _ASR_SUPPRESS_STATE["devnull"].close()
-                    except Exception:
-                        pass
-                    _ASR_SUPPRESS_STATE["devnull"] = None
 
 
-def _tokens_within_segment(seg_text: str, start: float, end: float) -> List[Word]:
+def _tokens_within_segment(seg_text: str, start: float, end: float) -> Words:
     toks = tokenize_words(seg_text)
-    if not toks: return [Word(seg_text.strip() or "<unk>", start, end)]
-    dur = max(0.0, end - start); n = len(toks)
-    if dur <= 0.0:
-        step = 0.01
-        return [Word(t, start + i*step, start + (i+1)*step) for i,t in enumerate(toks)]
-    step = dur / n; out=[]; cur=start
-    for t in toks:
-        nxt = cur + step
-        out.append(Word(t, cur, nxt)); cur = nxt
-    out[-1] = Word(out[-1].text, out[-1].start, end)
-    return out
+    if not toks: return Words([seg_text.strip() or "<unk>"], np.array([start], dtype=float), np.array([end], dtype=float))
+    n = len(toks)
+    if end - start <= 0.0:
+        edges = start + 0.01 * np.arange(n + 1)
+    else:
+        edges = np.linspace(start, end, n + 1)  # last edge is exactly `end`
+    return Words(toks, edges[:-1], edges[1:])
+
+
+# WhisperX handles are expensive to build (weights I/O + CUDA context), so keep
+# idle instances per config and hand each one to a single worker thread at a time.
+# TRANSCRIBE_KEEP_MODEL=0 restores load-per-file (handles are dropped after use).
+_KEEP_MODELS = (os.environ.get("TRANSCRIBE_KEEP_MODEL") or "1").strip().lower() not in ("0", "false", "no", "off")
+_MODEL_CACHE_LOCK = threading.Lock()
+_MODEL_CACHE: Dict[Tuple[Any, ...], List[Any]] = {}
+_ALIGN_CACHE: Dict[Tuple[Any, ...], List[Any]] = {}
+
+
+@contextlib.contextmanager
+def _checkout(cache: Dict[Tuple[Any, ...], List[Any]], key: Tuple[Any, ...], loader):
+    with _MODEL_CACHE_LOCK:
+        idle = cache.get(key)
+        handle = idle.pop() if idle else None
+    if handle is None:
+        handle = loader()
+    try:
+        yield handle
+    finally:
+        if _KEEP_MODELS:
+            with _MODEL_CACHE_LOCK:
+                cache.setdefault(key, []).append(handle)
+
+
+def _get_model(model_name: str, compute_type: str, device: str, language: Optional[str]):
+    return _checkout(
+        _MODEL_CACHE, (model_name, compute_type, device, language),
+        lambda: whisperx.load_model(model_name, device, compute_type=compute_type, language=language),
+    )
+
+
+def _get_align(language_code: str, device: str):
+    return _checkout(
+        _ALIGN_CACHE, (language_code, device),
+        lambda: whisperx.load_align_model(language_code=language_code, device=device),
+    )
+
+
+def _evict_models() -> None:
+    """Drop idle WhisperX handles and give their VRAM back."""
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+        _ALIGN_CACHE.clear()
+    _clear_cuda_cache()
+
 
+# Transcribe (CTranslate2) and align (torch wav2vec2) are separate GPU stages.
+# Each stage has its own gate, so file N+1 can transcribe while file N aligns;
+# the gates also cap how many files of each stage hold VRAM at once.
+_ASR_STAGE = threading.BoundedSemaphore(1)
+_ALIGN_STAGE = threading.BoundedSemaphore(1)
 
-def _try_whisperx(audio_path: Path, device: str, language: Optional[str],
+
+def _configure_asr_stages(slots: int) -> None:
+    global _ASR_STAGE, _ALIGN_STAGE
+    _ASR_STAGE = threading.BoundedSemaphore(max(1, slots))
+    _ALIGN_STAGE = threading.BoundedSemaphore(max(1, slots))
+
+
+@contextlib.contextmanager
+def _inference_ctx(device: str):
+    """No autograd bookkeeping for torch ops; FP16 autocast on cuda (CTranslate2 ASR is unaffected)."""
+    if torch is None:
+        yield
+        return
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(torch.inference_mode())
+        if device == "cuda":
+            stack.enter_context(torch.autocast("cuda", dtype=torch.float16))
+        yield
+
+
+_ASR_SAMPLE_RATE = 16000  # whisperx.load_audio always resamples to 16 kHz
+
+
+def _align_word_segments(segments, audio, language: str, device: str) -> List[Dict[str, Any]]:
+    with _ALIGN_STAGE, _suppress_asr_noise(), _get_align(language, device) as (model_a, metadata), \
+            _inference_ctx(device):
+        aligned = whisperx.align(segments, model_a, metadata, audio, device=device, return_char_alignments=False)
+    return aligned.get("word_segments", [])
+
+
+def _try_whisperx(audio, device: str, language: Optional[str],
                   model_name: str, compute_type: str, batch_size: int,
-                  prompt: Optional[str] = None):
-    with _suppress_asr_noise():
-        model = whisperx.load_model(model_name, device, compute_type=compute_type, language=language)
-        audio = whisperx.load_audio(str(audio_path))
-        kwargs = {"batch_size": batch_size, "language": language}
-        if prompt:
-            kwargs["initial_prompt"] = prompt
-        try:
-            result = model.transcribe(audio, **kwargs)
-        except TypeError:
-            if "initial_prompt" in kwargs:
-                kwargs.pop("initial_prompt", None)
+                  prompt: Optional[str] = None, min_free_vram: int = 0):
+    with _ASR_STAGE:
+        # inside the gate, so the reading already includes the files holding the GPU
+        if device == "cuda":
+            _wait_for_min_vram(min_free_vram)
+        with _suppress_asr_noise(), _get_model(model_name, compute_type, device, language) as model, \
+                _inference_ctx(device):
+            kwargs = {"batch_size": batch_size, "language": language}
+            if _ASR_CHUNK_SEC and 0 < _ASR_CHUNK_SEC <= 30:
+                kwargs["chunk_size"] = int(_ASR_CHUNK_SEC)
+            if prompt:
+                kwargs["initial_prompt"] = prompt
+            try:
                 result = model.transcribe(audio, **kwargs)
-            else:
-                raise
+            except TypeError:
+                if "initial_prompt" in kwargs:
+                    kwargs.pop("initial_prompt", None)
+                    result = model.transcribe(audio, **kwargs)
+                else:
+                    raise
 
     duration = float(result.get("duration", 0.0))
+    if duration == 0.0:
+        # the decoded waveform's length; the last segment end would miss trailing silence
+        duration = len(audio) / float(_ASR_SAMPLE_RATE)
     if duration == 0.0:
         segs = result.get("segments") or []
         if segs: duration = float(segs[-1].get("end", 0.0))
 
-    words: List[Word] = []
+    words = Words.empty()
     try:
-        with _suppress_asr_noise():
-            model_a, metadata = whisperx.load_align_model(language_code=result["language"], device=device)
-            aligned = whisperx.align(result["segments"], model_a, metadata, audio, device=device, return_char_alignments=False)
-        for w in aligned.get("word_segments", []):
+        texts: List[str] = []; starts: List[float] = []; ends: List[float] = []
+        for w in _align_word_segments(result["segments"], audio, result["language"], device):
             txt = (w.get("text") or "").strip()
-            if txt: words.append(Word(txt, float(w["start"]), float(w["end"])))
+            if txt:
+                texts.append(txt); starts.append(float(w["start"])); ends.append(float(w["end"]))
+        words = Words(texts, np.array(starts, dtype=float), np.array(ends, dtype=float)).monotonic()
     except Exception:
         pass
 
     if not words:
+        parts = []
         segs = result.get("segments") or []
         for s in segs:
             s_text = (s.get("text") or "").strip()
             s_start = float(s.get("start", 0.0))
             s_end = float(s.get("end", s_start))
-            words.extend(_tokens_within_segment(s_text, s_start, s_end))
+            parts.append(_tokens_within_segment(s_text, s_start, s_end))
+        words = Words.concat(parts)
 
     lang = result.get("language", language or "unk")
     return words, lang, duration
 
 
 def transcribe_words(audio_path: Path, device: str, language: Optional[str],
-                     prompt: Optional[str] = None):
+                     prompt: Optional[str] = None, min_free_vram: int = 0):
     if whisperx is None:
         eprint(f"[asr] skip {audio_path.name}")
-        return [], (language or "unk"), 0.0
+        return Words.empty(), (language or "unk"), 0.0
 
     if device == "cuda":
         attempts = [
@@ -683,6 +1006,7 @@ def transcribe_words(audio_path: Path, device: str, language: Optional[str],
             # ("large-v2","float16",4),
             # ("large-v2","float16",2),
             # ("large-v2","float16",1),
+            ("medium","float16",16),
             ("medium","float16",8),
             # ("medium","float16",4),
             # ("medium","float16",2),
@@ -694,17 +1018,25 @@ def transcribe_words(audio_path: Path, device: str, language: Optional[str],
     else:
         attempts = [("small","float32",1),("base","float32",1)]
 
+    # decode once; every attempt (and the cpu fallback) reuses the same waveform
+    try:
+        with _suppress_asr_noise():
+            audio = whisperx.load_audio(str(audio_path))
+    except Exception as e:
+        eprint(f"[asr!] {audio_path.name}: load failed: {e}")
+        return Words.empty(), (language or "unk"), 0.0
+
     last_err=None
     for model_name,ctype,bs in attempts:
         try:
             eprint(f"[asr] {audio_path.name} {model_name}/{ctype} bs={bs} dev={device}")
-            return _try_whisperx(audio_path, device, language, model_name, ctype, bs, prompt=prompt)
+            return _try_whisperx(audio, device, language, model_name, ctype, bs, prompt=prompt,
+                                 min_free_vram=min_free_vram)
         except RuntimeError as e:
             msg = str(e).lower(); last_err=e
             if ("out of memory" in msg or "cuda" in msg) and torch is not None and device=="cuda":
                 eprint("[oom] retry smaller")
-                try: torch.cuda.empty_cache()
-                except Exception: pass
+                _evict_models()
                 continue
             break
         except Exception as e:
@@ -713,18 +1045,18 @@ def transcribe_words(audio_path: Path, device: str, language: Optional[str],
     if device == "cuda":
         try:
             eprint("[fallback] cpu/small")
-            return _try_whisperx(audio_path, "cpu", language, "small", "float32", 1)
+            return _try_whisperx(audio, "cpu", language, "small", "float32", 1)
         except Exception as e:
             last_err=e
 
     eprint(f"[asr!] {audio_path.name}")
-    return [], (language or "unk"), 0.0
+    return Words.empty(), (language or "unk"), 0.0
 
 
-def _summarize_words(words: List[Word], limit: int = 9999999999) -> str:
+def _summarize_words(words: Words, limit: int = 9999999999) -> str:
     if not words:
         return "<empty>"
-    sample = " ".join(w.text for w in words[:limit])
+    sample = " ".join(words.text[:limit])
     if len(words) > limit:
         sample += " ..."
     return sample
@@ -751,11 +1083,11 @@ def sanitize_text(s: str, for_split: bool = False) -> str:
         s = s.replace("\\n", "\n").replace("\\r", "\r")
         local_map = dict(SANITIZE_MAP); local_map.pop('…', None)
         s = s.translate(str.maketrans(local_map))
-        s = re.sub(r"[ \t\f\v]+", " ", s)
+        s = _HSPACE_RE.sub(" ", s)
     else:
         s = s.translate(SANITIZE_TR)
-        s = re.sub(r"\.{4,}", "...", s)
-        s = re.sub(r"\s+", " ", s)
+        s = _ELLIPSIS_RUN_RE.sub("...", s)
+        s = _WS_RE.sub(" ", s)
     return s.strip()
 
 # -------- sentences & alignment --------
@@ -764,23 +1096,45 @@ class Sentence:
     text: str
     norm: str
     tokens: List[str]
+    # bookkeeping copied into the transcript items (manga order/chunk, text parts)
+    chunk: Optional[int] = None
+    order: Any = None
+    suborder: Optional[int] = None
+    merged_into: Any = None
+    pre_merged_text: Optional[str] = None
+    placeholder: bool = False
+    meta: Optional[Dict[str, Any]] = None  # extra text-part details, informational only
+
+    @property
+    def norm_len(self) -> int:
+        """max(1, len(text.strip())), the fallback timing weight; kept until text is reassigned."""
+        text = self.text
+        hit = self.__dict__.get("_norm_len")
+        if hit is not None and hit[0] is text:
+            return hit[1]
+        n = max(1, len((text or "").strip()))
+        self.__dict__["_norm_len"] = (text, n)
+        return n
 
 def _is_weak_opener_text(txt: str) -> bool:
     t = txt.strip()
     return t in {"—", "-", "–"} or len(t) <= 2
 
 
+# sentence end followed (after optional spaces) by something that can open a sentence
+_SENT_BOUNDARY_RE = re.compile(r"[.!?…؟]\s*(?=[^\W_]|[«\"'“”(])")
+_ARABIC_RE = re.compile(r"[\u0600-\u06FF]")
+_LINE_BREAKS_RE = re.compile(r"(?:\r?\n)+")
+
+
 def split_into_sentences(text: str) -> List[str]:
     if not text:
         return []
     text = text.replace("\\n", "\n").replace("\\r", "\r")
-    has_arabic = bool(re.search(r"[\u0600-\u06FF]", text))
+    has_arabic = _ARABIC_RE.search(text) is not None
     min_len = 20 if has_arabic else MIN_SENT_CHARS
 
-    def _is_sentence_starter(ch: str) -> bool:
-        return (ch.isalpha() or ch.isdigit() or ch in "«\"'“”(")
-
-    line_blocks = [blk for blk in re.split(r"(?:\r?\n)+", text) if blk.strip()]
+    line_blocks = [blk for blk in _LINE_BREAKS_RE.split(text) if blk.strip()]
     all_parts: List[str] = []
 
     for block in line_blocks:
@@ -788,36 +1142,24 @@ def split_into_sentences(text: str) -> List[str]:
         if not para:
             continue
         parts: List[str] = []
-        start = 0; i = 0; n = len(para)
-        while i < n:
-            ch = para[i]
-            if ch in ".!?…؟":
-                j = i + 1
-                while j < n and para[j].isspace():
-                    j += 1
-                if j >= n:
-                    frag = para[start:].strip()
-                    if frag: parts.append(frag)
-                    start = n; break
-                if _is_sentence_starter(para[j]):
-                    frag = para[start:i + 1].strip()
-                    if frag: parts.append(frag)
-                    start = j; i = j; continue
-            i += 1
-        if start < n:
-            tail = para[start:].strip()
-            if tail: parts.append(tail)
+        start = 0
+        for m in _SENT_BOUNDARY_RE.finditer(para):
+            frag = para[start:m.start() + 1].strip()
+            if frag: parts.append(frag)
+            start = m.end()
+        tail = para[start:].strip()
+        if tail: parts.append(tail)
 
         # merge weak openers
         merged: List[str] = []
-        k = 0
-        while k < len(parts):
-            cur = parts[k]
-            if _is_weak_opener_text(cur) and (k + 1) < len(parts):
-                merged.append((cur.rstrip() + " " + parts[k + 1].lstrip()).strip())
-                k += 2
-            else:
-                merged.append(cur); k += 1
+        it = iter(parts)
+        for cur in it:
+            if _is_weak_opener_text(cur):
+                nxt = next(it, None)
+                if nxt is not None:
+                    merged.append((cur.rstrip() + " " + nxt.lstrip()).strip())
+                    continue
+            merged.append(cur)
 
         # glue short
         result_block: List[str] = []
@@ -839,20 +1181,10 @@ def split_into_sentences(text: str) -> List[str]:
                 result_block.append(carry)
 
         # dedupe consecutive
-        deduped: List[str] = []
-        prev = None
-        for it in result_block:
-            if it != prev:
-                deduped.append(it); prev = it
-        all_parts.extend(deduped)
+        all_parts.extend(k for k, _ in itertools.groupby(result_block))
 
     # final dedupe
-    final: List[str] = []
-    prev = None
-    for it in all_parts:
-        if it != prev:
-            final.append(it); prev = it
-    return final
+    return [k for k, _ in itertools.groupby(all_parts)]
 
 # --- TTS-style balanced split helpers (JS parity) ---
 def _safe_break_index(s: str, idx: int) -> int:
@@ -870,9 +1202,8 @@ def _find_break(remaining: str, limit: int) -> int:
     masked = _mask_tags(window)
     spans = _iter_tag_spans(remaining)
     best = -1
-    rx = re.compile(r'([.!?…]+[)"»\]]?\s)')
-    for m in rx.finditer(masked):
-        best = m.start() + len(m.group(0))
+    for m in _BREAK_SENT_END_RE.finditer(masked):
+        best = m.end()
     if best >= int(limit * 0.6):
         idx = _adjust_break_index(best, spans)
         if idx <= 0:
@@ -895,16 +1226,15 @@ def _find_break(remaining: str, limit: int) -> int:
 
 def _split_into_sentences_with_paras(source: str) -> List[str]:
     result: List[str] = []
-    paras = re.split(r"\n\s*\n", source)
+    paras = _PARA_SPLIT_RE.split(source)
     for p_idx, p in enumerate(paras):
         p = (p or "").strip()
         if not p:
             continue
         i = 0
-        rx = re.compile(r'([.!?…]+[)"»\]]*)(\s+|$)')
         masked = _mask_tags(p)
-        for m in rx.finditer(masked):
-            end = m.start() + len(m.group(0))
+        for m in _PARA_SENT_END_RE.finditer(masked):
+            end = m.end()
             sent = p[i:end]
             if sent.strip():
                 result.append(sent)
@@ -951,19 +1281,20 @@ def split_balanced_tts(source: str, limit: int) -> List[str]:
     sents = normalized
 
     n = len(sents)
-    pref = [0] * (n + 1)
-    for i in range(n):
-        pref[i + 1] = pref[i] + len(sents[i])
-
-    def chunk_cost(i: int, j: int) -> float:
-        length = pref[j] - pref[i]
-        if length > limit:
-            return float("inf")
-        slack = limit - length
-        return slack * slack
-
-    best = [float("inf")] * (n + 1)
-    next_break = [-1] * (n + 1)
+    pref = np.zeros(n + 1, dtype=np.int64)
+    if n:
+        np.cumsum([len(s) for s in sents], out=pref[1:])
+
+    # Everything fits into one chunk: any extra break only adds slack, so the
+    # DP would pick the single chunk anyway.
+    if pref[n] <= limit:
+        text = "".join(sents).strip()
+        return [text] if text else []
+
+    # Feasible ends of a chunk starting at i are a contiguous run found by
+    # searchsorted on the prefix sums; each run is scored in one vector op.
+    best = np.full(n + 1, np.inf)
+    next_break = np.full(n + 1, -1, dtype=np.int64)
     best[n] = 0.0
 
     for i in range(n - 1, -1, -1):
@@ -971,18 +1302,20 @@ def split_balanced_tts(source: str, limit: int) -> List[str]:
             best[i] = best[i + 1]
             next_break[i] = i + 1
             continue
-        j = i + 1
-        while j <= n and (pref[j] - pref[i]) <= limit:
-            cost = chunk_cost(i, j) + best[j]
-            if cost < best[i]:
-                best[i] = cost
-                next_break[i] = j
-            j += 1
+        j_max = int(np.searchsorted(pref, pref[i] + limit, side="right")) - 1
+        if j_max <= i:
+            continue
+        slack = limit - (pref[i + 1:j_max + 1] - pref[i])
+        costs = (slack * slack).astype(np.float64) + best[i + 1:j_max + 1]
+        k = int(costs.argmin())  # first minimum -> shortest chunk on ties
+        if costs[k] < np.inf:
+            best[i] = costs[k]
+            next_break[i] = i + 1 + k
 
     chunks: List[str] = []
     i = 0
     while i < n:
-        j = next_break[i]
+        j = int(next_break[i])
         if j == -1 or j <= i:
             j = min(n, i + 1)
         text = "".join(sents[i:j]).strip()
@@ -995,7 +1328,7 @@ def split_balanced_tts(source: str, limit: int) -> List[str]:
 def _tokens_from_text_for_order(text: str) -> List[str]:
     if not text:
         return []
-    text = re.sub(r"\[[^][]*\]", "", text)
+    text = _BRACKET_TAG_RE.sub("", text)
     vis = sanitize_text(text, for_split=False)
     nrm = norm_text(vis)
     return tokenize_words(nrm)
@@ -1004,7 +1337,11 @@ def _tokens_from_text_for_order(text: str) -> List[str]:
 def _find_token_subsequence(stream: List[str],
                             seq: List[str],
                             start: int,
-                            max_seek: int = 5000) -> Optional[int]:
+                            max_seek: int = 5000,
+                            postings: Optional[Dict[str, List[int]]] = None) -> Optional[int]:
+    """First i >= start (within max_seek) with stream[i:i+len(seq)] == seq.
+    `postings` (token -> ascending positions in stream) lets us jump straight
+    between occurrences of seq[0] instead of scanning for them."""
     if not seq:
         return start
     if start < 0:
@@ -1015,6 +1352,16 @@ def _find_token_subsequence(stream: List[str],
     if max_seek is not None and max_seek > 0:
         max_i = min(max_i, start + max_seek)
     first = seq[0]
+    if postings is not None:
+        occ = postings.get(first, [])
+        n = len(seq)
+        for k in range(bisect.bisect_left(occ, start), len(occ)):
+            i = occ[k]
+            if i > max_i:
+                break
+            if stream[i:i + n] == seq:
+                return i
+        return None
     i = start
     while i <= max_i:
         try:
@@ -1028,54 +1375,48 @@ def _find_token_subsequence(stream: List[str],
 
 
 def _dominant_order(orders: List[Any]) -> Optional[Any]:
-    counts: Dict[Any, int] = {}
-    first_idx: Dict[Any, int] = {}
-    for i, order in enumerate(orders):
-        if order is None:
-            continue
-        counts[order] = counts.get(order, 0) + 1
-        if order not in first_idx:
-            first_idx[order] = i
-    if not counts:
-        return None
-    return max(counts.keys(), key=lambda k: (counts[k], -first_idx.get(k, 0)))
+    # Counter keeps first-seen order and most_common(1) returns the first maximum,
+    # so ties still go to the order that appears earliest
+    counts = Counter(o for o in orders if o is not None)
+    return counts.most_common(1)[0][0] if counts else None
 
 
 def _assign_orders_to_sentences(sentences: List[Sentence],
                                 parts: List[Dict[str, Any]]) -> None:
-    flat_tokens: List[str] = []
-    flat_orders: List[Any] = []
-    for p in parts:
-        if not isinstance(p, dict):
-            continue
-        order = p.get("order")
-        tokens = _tokens_from_text_for_order(p.get("text", ""))
-        for tok in tokens:
-            flat_tokens.append(tok)
-            flat_orders.append(order)
+    part_tokens = [(p.get("order"), _tokens_from_text_for_order(p.get("text", "")))
+                   for p in parts if isinstance(p, dict)]
+    total = sum(len(tokens) for _, tokens in part_tokens)
+    flat_tokens: List[str] = [""] * total
+    flat_orders: List[Any] = [None] * total
+    pos = 0
+    for order, tokens in part_tokens:
+        end = pos + len(tokens)
+        flat_tokens[pos:end] = tokens
+        flat_orders[pos:end] = [order] * len(tokens)
+        pos = end
 
     if not flat_tokens:
         eprint("[manga] warn: empty token stream for order mapping")
         return
 
+    postings: Dict[str, List[int]] = {}
+    for pos, tok in enumerate(flat_tokens):
+        postings.setdefault(tok, []).append(pos)
+
     cursor = 0
     misses = 0
     spans = 0
     for s in sentences:
-        meta = getattr(s, "meta", None)
-        if not isinstance(meta, dict):
-            meta = {}
-            s.meta = meta
         if not s.tokens:
-            meta["order"] = None
+            s.order = None
             continue
-        pos = _find_token_subsequence(flat_tokens, s.tokens, cursor)
+        pos = _find_token_subsequence(flat_tokens, s.tokens, cursor, postings=postings)
         if pos is None:
-            meta["order"] = None
+            s.order = None
             misses += 1
             continue
         span_orders = flat_orders[pos:pos + len(s.tokens)]
-        meta["order"] = _dominant_order(span_orders)
+        s.order = _dominant_order(span_orders)
         if len({o for o in span_orders if o is not None}) > 1:
             spans += 1
         cursor = pos + len(s.tokens)
@@ -1089,41 +1430,38 @@ def _assign_orders_to_sentences(sentences: List[Sentence],
 def _assign_suborders(sentences: List[Sentence]) -> None:
     counters: Dict[Any, int] = {}
     for s in sentences:
-        meta = getattr(s, "meta", None)
-        if not isinstance(meta, dict):
-            meta = {}
-            s.meta = meta
-        order = meta.get("order")
+        order = s.order
         if order is None:
-            meta["suborder"] = None
+            s.suborder = None
             continue
         sub = counters.get(order, 0)
-        meta["suborder"] = sub
+        s.suborder = sub
         counters[order] = sub + 1
 
 
 def _rebuild_chunk_ranges(sentences: List[Sentence]) -> List[Tuple[int, int]]:
     if not sentences:
         return []
-    ranges: List[Tuple[int, int]] = []
-    start = 0
-    prev_chunk = getattr(sentences[0], "meta", {}).get("chunk")
-    for i, s in enumerate(sentences):
-        chunk = getattr(s, "meta", {}).get("chunk")
-        if chunk != prev_chunk:
-            ranges.append((start, i))
-            start = i
-            prev_chunk = chunk
-    ranges.append((start, len(sentences)))
-    return ranges
+    # chunk values (ints or None) -> dense ids; boundaries are where the id changes
+    ids: Dict[Any, int] = {}
+    chunks = np.fromiter((ids.setdefault(s.chunk, len(ids)) for s in sentences),
+                         dtype=np.int64, count=len(sentences))
+    bounds = [0, *(np.flatnonzero(np.diff(chunks)) + 1).tolist(), len(sentences)]
+    return list(zip(bounds[:-1], bounds[1:]))
 
 
 def _merge_sentences_with_meta(left: Sentence,
                                right: Sentence,
-                               keep_meta: Dict[str, Any]) -> Sentence:
+                               keep: Sentence) -> Sentence:
     merged_text = (left.text.rstrip() + " " + right.text.lstrip()).strip()
     merged = make_sentence(merged_text)
-    merged.meta = dict(keep_meta) if isinstance(keep_meta, dict) else {}
+    merged.chunk = keep.chunk
+    merged.order = keep.order
+    merged.suborder = keep.suborder
+    merged.merged_into = keep.merged_into
+    merged.pre_merged_text = keep.pre_merged_text
+    merged.placeholder = keep.placeholder
+    merged.meta = dict(keep.meta) if keep.meta else None
     return merged
 
 
@@ -1141,9 +1479,7 @@ def _coalesce_short_sentences_with_meta(items: List[Sentence],
         return False
 
     def _same_bucket(a: Sentence, b: Sentence) -> bool:
-        ma = getattr(a, "meta", {}) if isinstance(getattr(a, "meta", None), dict) else {}
-        mb = getattr(b, "meta", {}) if isinstance(getattr(b, "meta", None), dict) else {}
-        return ma.get("chunk") == mb.get("chunk") and ma.get("order") == mb.get("order")
+        return a.chunk == b.chunk and a.order == b.order
 
     i = 0
     while i < len(items):
@@ -1152,12 +1488,12 @@ def _coalesce_short_sentences_with_meta(items: List[Sentence],
             i += 1
             continue
         if i > 0 and _same_bucket(items[i - 1], s):
-            merged = _merge_sentences_with_meta(items[i - 1], s, items[i - 1].meta)
+            merged = _merge_sentences_with_meta(items[i - 1], s, items[i - 1])
             items[i - 1] = merged
             del items[i]
             continue
         if i + 1 < len(items) and _same_bucket(s, items[i + 1]):
-            merged = _merge_sentences_with_meta(s, items[i + 1], items[i + 1].meta)
+            merged = _merge_sentences_with_meta(s, items[i + 1], items[i + 1])
             items[i + 1] = merged
             del items[i]
             continue
@@ -1182,7 +1518,7 @@ def _build_manga_sentences_from_texts(text_blocks: List[str],
         part_sents = build_sentence_stream([chunk])
         split_multi_sentences_inplace(part_sents)
         for s in part_sents:
-            s.meta = {"chunk": chunk_idx}
+            s.chunk = chunk_idx
         start = len(sentences)
         sentences.extend(part_sents)
         end = len(sentences)
@@ -1202,10 +1538,25 @@ def build_sentence_stream(texts: List[str]) -> List[Sentence]:
 
 # --- helpers for building Sentence objects and pre-splitting ---
 SPLIT_HARD_RE = re.compile(r'(?<=[\.\!\?…])\s+(?=[«"\“”„(]*[A-ZА-ЯЁ0-9])')
+# Same breaks as SPLIT_HARD_RE, but led by the punctuation class so re can use its
+# charset prefix scan instead of trying the lookbehind at every position.
+_HARD_BREAK_RE = re.compile(r'[.!?…](\s+)(?=[«"“”„(]*[A-ZА-ЯЁ0-9])')
+
+
+def _split_hard(text: str) -> List[str]:
+    """Equivalent of SPLIT_HARD_RE.split(text)."""
+    out: List[str] = []
+    prev = 0
+    for m in _HARD_BREAK_RE.finditer(text):
+        ws_start, ws_end = m.span(1)
+        out.append(text[prev:ws_start])
+        prev = ws_end
+    out.append(text[prev:])
+    return out
 
 def make_sentence(text: str) -> Sentence:
-    text = re.sub(r"\[[^][]*\]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _BRACKET_TAG_RE.sub("", text)
+    text = _collapse_ws(text)
     vis = sanitize_text(text, for_split=False)
 
     nrm = norm_text(vis)
@@ -1220,55 +1571,104 @@ def coalesce_short_sentences_inplace(items: List[Sentence],
     """
     if (min_chars or 0) <= 0 and (min_tokens or 0) <= 0:
         return
-    i = 0
-    while i < len(items):
-        s = items[i]
-        too_short = False
-        if min_chars and len(s.text.strip()) < min_chars:
-            too_short = True
-        if min_tokens and len(s.tokens) < min_tokens:
-            too_short = True
-        if not too_short:
-            i += 1
-            continue
 
-        if i > 0:
-            merged = (items[i-1].text.rstrip() + " " + s.text.lstrip()).strip()
-            items[i-1] = make_sentence(merged)
-            del items[i]
-            # остаёмся на том же i, т.к. сдвинулась лента
-        elif i + 1 < len(items):
-            merged = (s.text.rstrip() + " " + items[i+1].text.lstrip()).strip()
-            items[i+1] = make_sentence(merged)
-            del items[i]
+    def too_short(s: Sentence) -> bool:
+        return bool((min_chars and len(s.text.strip()) < min_chars)
+                    or (min_tokens and len(s.tokens) < min_tokens))
+
+    # one pass into a fresh list instead of del items[i] (O(n) shift each time)
+    out: List[Sentence] = []
+    head: Optional[Sentence] = None  # short leading sentence waiting to merge forward
+    for s in items:
+        if head is not None:
+            s = make_sentence((head.text.rstrip() + " " + s.text.lstrip()).strip())
+            head = None
+        if not too_short(s):
+            out.append(s)
+        elif out:
+            merged = (out[-1].text.rstrip() + " " + s.text.lstrip()).strip()
+            out[-1] = make_sentence(merged)
         else:
-            # единственный элемент — оставляем как есть
-            i += 1
+            # первый элемент — сливаем со следующим (результат проверяется снова)
+            head = s
+    if head is not None:
+        # единственный элемент — оставляем как есть
+        out.append(head)
+    items[:] = out
 
 def split_multi_sentences_inplace(items: List[Sentence]) -> None:
-    i = 0
-    while i < len(items):
-        txt = items[i].text
-        parts = [p.strip() for p in SPLIT_HARD_RE.split(txt) if p.strip()]
+    out: List[Sentence] = []
+    changed = False
+    for it in items:
+        parts = [p.strip() for p in _split_hard(it.text) if p.strip()]
         if len(parts) > 1:
-            # заменить текущий и вставить остальные как полноценные Sentence
-            items[i] = make_sentence(parts[0])
-            j = 1
-            while j < len(parts):
-                items.insert(i + j, make_sentence(parts[j]))
-                j += 1
-            i += len(parts)
+            # заменить текущий полноценными Sentence по частям
+            out.extend(make_sentence(p) for p in parts)
+            changed = True
         else:
-            i += 1
-
-
-def _best_score(a: str, b: str) -> int:
-    return max(
-        int(fuzz.ratio(a, b)),
-        int(fuzz.partial_ratio(a, b)),
-        int(fuzz.token_set_ratio(a, b)),
-        int(fuzz.token_sort_ratio(a, b)),
-    )
+            out.append(it)
+    if changed:
+        items[:] = out
+
+
+_WINDOW_SCORERS = (fuzz.ratio, fuzz.partial_ratio, fuzz.token_set_ratio, fuzz.token_sort_ratio)
+
+
+def _best_scores(a: str, wins: List[str], cutoff: int = 0) -> np.ndarray:
+    """Best of ratio/partial/token_set/token_sort per window: one cdist row per
+    scorer (float64, so int() truncation matches the scalar fuzz calls).
+    Scores below `cutoff` come back as 0, which lets rapidfuzz bail out early."""
+    if not wins:
+        return np.zeros(0, dtype=np.int64)
+    rows = [cdist([a], wins, scorer=sc, dtype=np.float64, workers=1, score_cutoff=cutoff)[0]
+            for sc in _WINDOW_SCORERS]
+    return np.max(rows, axis=0).astype(np.int64)
+
+
+def _window_scores(s_norm: str, s_compact: str, wins: List[str], threshold: int,
+                   compact_at: Optional[Callable[[int], str]] = None) -> np.ndarray:
+    """Score windows like the scalar path: windows below threshold get a second
+    chance on their compact (alnum-only) form, taken from compact_at(idx) if given."""
+    # sub-threshold values are only ever compared against threshold, so they may be 0
+    scores = _best_scores(s_norm, wins, threshold)
+    if s_compact:
+        if compact_at is None:
+            compact_at = lambda idx: _compact_for_match(wins[idx])
+        low = [(idx, compact_at(idx)) for idx in np.flatnonzero(scores < threshold)]
+        low = [(idx, comp) for idx, comp in low if comp]
+        if low:
+            idxs = np.fromiter((idx for idx, _ in low), dtype=np.int64, count=len(low))
+            comp_scores = _best_scores(s_compact, [comp for _, comp in low], threshold)
+            scores[idxs] = np.maximum(scores[idxs], comp_scores)
+    return scores
+
+
+def _first_window_hit(s_norm: str, s_compact: str, wins: List[str], threshold: int,
+                      compact_at: Callable[[int], str]) -> int:
+    """Index of the first window _window_scores would put at/above threshold, or -1.
+    Each scorer (and the compact pass) only runs on windows before the earliest
+    hit found so far, so most windows never reach the slower scorers."""
+    limit = len(wins)
+    for sc in _WINDOW_SCORERS:
+        if limit == 0:
+            break
+        row = cdist([s_norm], wins[:limit], scorer=sc, dtype=np.float64, workers=1, score_cutoff=threshold)[0]
+        hits = np.flatnonzero(row >= threshold)
+        if hits.size:
+            limit = int(hits[0])
+    if s_compact and limit > 0:
+        low = [(idx, compact_at(idx)) for idx in range(limit)]
+        low = [(idx, comp) for idx, comp in low if comp]
+        for sc in _WINDOW_SCORERS:
+            if not low:
+                break
+            row = cdist([s_compact], [comp for _, comp in low], scorer=sc,
+                        dtype=np.float64, workers=1, score_cutoff=threshold)[0]
+            hits = np.flatnonzero(row >= threshold)
+            if hits.size:
+                limit = low[int(hits[0])][0]
+                low = low[:int(hits[0])]
+    return limit if limit < len(wins) else -1
 
 
 class IncrementalAligner:
@@ -1280,7 +1680,23 @@ class IncrementalAligner:
         self.max_checks = max_checks
         self.dynamic_factor = dynamic_factor
         self.word_texts: List[str] = []
-        self.words: List[Word] = []
+        # _compact_for_match of each word_texts entry; a window's compact form is
+        # the plain concatenation since compacting drops the separating spaces
+        self.word_compacts: List[str] = []
+        self.compact_tail_index: Dict[str, List[int]] = {}  # compact -> word positions (ascending)
+        # word start/end times rounded to ms once at ingest
+        self.word_start_ms: List[int] = []
+        self.word_end_ms: List[int] = []
+        # running max of word end times (ms): sorted even when ASR ends wobble, so
+        # bisect finds the same "first word ending at/after t" as a linear scan
+        self.word_end_ms_max: List[int] = []
+        # " ".join(word_texts) plus each word's start offset in it (one extra entry
+        # one past the end), so any window string is a single slice of this arena
+        self.joined_text = ""
+        self.word_offsets: List[int] = [0]
+        # word times in seconds, kept as plain columns (no per-word Word objects)
+        self.word_start_s: List[float] = []
+        self.word_end_s: List[float] = []
         self.word_srcs: List[Optional[str]] = []
         self.cursor = 0
         self.sent_idx = 0
@@ -1293,7 +1709,44 @@ class IncrementalAligner:
         self.text_parts_manager = text_parts_manager
 
     def _window_str(self, i: int, j: int) -> str:
-        return " ".join(self.word_texts[i:j])
+        """Same as " ".join(self.word_texts[i:j]) for 0 <= i < j <= len(words)."""
+        return self.joined_text[self.word_offsets[i]:self.word_offsets[j] - 1]
+
+    def _rebuild_joined(self) -> None:
+        self.joined_text = " ".join(self.word_texts)
+        self.word_offsets = [0]
+        for t in self.word_texts:
+            self.word_offsets.append(self.word_offsets[-1] + len(t) + 1)
+
+    def _append_words(self, new_words: Words, src: Optional[str]) -> None:
+        if src:
+            src = sys.intern(src)  # every word/result of a file shares one string object
+        base = len(self.word_texts)
+        starts = new_words.start.tolist()
+        ends = new_words.end.tolist()
+        texts = [_norm_word(t) for t in new_words.text]
+        comps = [_compact_for_match(t) for t in texts]
+        for pos, comp in enumerate(comps, base):
+            if comp:
+                self.compact_tail_index.setdefault(comp, []).append(pos)
+        run_max = self.word_end_ms_max[-1] if self.word_end_ms_max else None
+        self.word_start_ms.extend(int(round(x * 1000)) for x in starts)
+        end_ms_new = [int(round(x * 1000)) for x in ends]
+        self.word_end_ms.extend(end_ms_new)
+        for end_ms in end_ms_new:
+            if run_max is None or end_ms > run_max:
+                run_max = end_ms
+            self.word_end_ms_max.append(run_max)
+        if texts:
+            chunk = " ".join(texts)
+            self.joined_text = chunk if not self.word_texts else self.joined_text + " " + chunk
+            for t in texts:
+                self.word_offsets.append(self.word_offsets[-1] + len(t) + 1)
+        self.word_start_s.extend(starts)
+        self.word_end_s.extend(ends)
+        self.word_texts.extend(texts)
+        self.word_compacts.extend(comps)
+        self.word_srcs.extend([src] * len(texts))
 
     def _dominant_src(self, i: int, j: int, st_ms: int, en_ms: int) -> Optional[str]:
         """Выбираем источник по МАКСИМАЛЬНОМУ ПЕРЕКРЫТИЮ ОТРЕЗКА [st,en] по времени."""
@@ -1302,18 +1755,18 @@ class IncrementalAligner:
         st_s = st_ms / 1000.0
         en_s = en_ms / 1000.0
         overlap: Dict[str, float] = {}
-        for w, sname in zip(self.words[i:j], self.word_srcs[i:j]):
+        for w_st, w_en, sname in zip(self.word_start_s[i:j], self.word_end_s[i:j], self.word_srcs[i:j]):
             if not sname:
                 continue
-            a = max(w.start, st_s)
-            b = min(w.end, en_s)
+            a = max(w_st, st_s)
+            b = min(w_en, en_s)
             if b > a:
                 overlap[sname] = overlap.get(sname, 0.0) + (b - a)
         if overlap:
             return max(overlap.items(), key=lambda kv: kv[1])[0]
         # Фоллбек: берём источник слова, пересекающего начало интервала
         for k in range(i, j):
-            if self.words[k].end >= st_s:
+            if self.word_end_s[k] >= st_s:
                 return self.word_srcs[k]
         # Финальный фоллбек: голосование по числу слов (как было)
         freq: Dict[str, int] = {}
@@ -1325,10 +1778,7 @@ class IncrementalAligner:
 
     def _ptr_for_time(self, t_ms: int) -> int:
         """Find first word index whose end >= t_ms (milliseconds)."""
-        for k, w in enumerate(self.words):
-            if int(round(w.end * 1000)) >= t_ms:
-                return k
-        return len(self.words)
+        return bisect.bisect_left(self.word_end_ms_max, t_ms)
 
     def _try_match_sentence_core(self, s: Sentence, aggressive: bool) -> Optional[Tuple[int,int,Optional[str],int]]:
         L = max(1, len(s.tokens))
@@ -1337,7 +1787,7 @@ class IncrementalAligner:
                       else [1.0, 1.3, 1.6, 2.0])
         max_extra = max(MAX_EXTRA_TOKENS, int(L * (0.6 if aggressive else 0.2)))
         max_len = L + max_extra
-        dyn_limit = max(self.max_checks, self.dynamic_factor * max(0, len(self.words) - self.cursor))
+        dyn_limit = max(self.max_checks, self.dynamic_factor * max(0, len(self.word_texts) - self.cursor))
         if aggressive:
             dyn_limit = max(dyn_limit, 200_000)
         score_threshold = 62 if aggressive else self.min_score
@@ -1347,17 +1797,15 @@ class IncrementalAligner:
         require_tail = (len(s.tokens) >= 8 and len(last_compact) >= 3)
         tail_positions: Optional[List[int]] = None
         if require_tail:
-            tail_positions = [
-                idx for idx in range(self.cursor, len(self.word_texts))
-                if _compact_token_eq(self.word_texts[idx], last_tok)
-            ]
+            occ = self.compact_tail_index.get(last_compact, [])
+            tail_positions = occ[bisect.bisect_left(occ, self.cursor):]
 
         checks = 0
         def _end_idx_from_matches(win_tokens: List[str], start_idx: int, fallback_end_idx: int) -> int:
             if not s.tokens:
                 return fallback_end_idx
             sent_comp = [_compact_for_match(t) for t in s.tokens]
-            win_comp = [_compact_for_match(t) for t in win_tokens]
+            win_comp = self.word_compacts[start_idx:start_idx + len(win_tokens)]
             sent_i = 0
             w_i = 0
             last_match = None
@@ -1403,7 +1851,7 @@ class IncrementalAligner:
             seen = set()
             for k0 in base_lens:
                 k = max(1, int(k0 * exp))
-                if k not in seen and k <= (len(self.words) - self.cursor):
+                if k not in seen and k <= (len(self.word_texts) - self.cursor):
                     cand.append(k); seen.add(k)
             if not cand:
                 continue
@@ -1413,70 +1861,65 @@ class IncrementalAligner:
             if require_tail and tail_positions:
                 for end_idx in tail_positions:
                     best = None  # (score, i, k)
-                    for k in cand:
-                        i = end_idx - (k - 1)
-                        if i < self.cursor or (i + k) > len(self.words):
-                            continue
-                        if checks > dyn_limit:
-                            break
-                        win_tokens = self.word_texts[i:i + k]
-                        win = " ".join(win_tokens)
-                        score = _best_score(s.norm, win)
-                        checks += 1
-                        if score < score_threshold and s_compact:
-                            win_compact = _compact_for_match(win)
-                            if win_compact:
-                                score = max(score, _best_score(s_compact, win_compact))
-                        if best is None or score > best[0]:
-                            best = (score, i, k)
+                    # all candidate lengths ending at this tail token, scored in one batch
+                    wins_ik = [(end_idx - (k - 1), k) for k in cand
+                               if end_idx - (k - 1) >= self.cursor and end_idx + 1 <= len(self.word_texts)]
+                    wins_ik = wins_ik[:max(0, dyn_limit + 1 - checks)]
+                    if wins_ik:
+                        wins = [self._window_str(i, i + k) for i, k in wins_ik]
+                        scores = _window_scores(
+                            s.norm, s_compact, wins, score_threshold,
+                            lambda b: "".join(self.word_compacts[wins_ik[b][0]:wins_ik[b][0] + wins_ik[b][1]]))
+                        checks += len(wins_ik)
+                        b = int(scores.argmax())
+                        best = (int(scores[b]),) + wins_ik[b]
                     if checks > dyn_limit:
                         break
                     if best and best[0] >= score_threshold:
                         _, i, k = best
-                        win_tokens = self.word_texts[i:i + k]
-                        end_idx = _end_idx_from_matches(win_tokens, i, i + k)
-                        st0 = int(round(self.words[i].start * 1000))
-                        en0 = int(round(self.words[end_idx - 1].end * 1000))
-                        st = max(st0, self.last_end_ms + 1)
-                        en = max(en0, st)
-                        if (en - st) < MIN_MATCH_MS:
-                            en = st + MIN_MATCH_MS
-                        src_win = None
-                        return st, en, src_win, end_idx
+                        return self._window_hit(i, k, _end_idx_from_matches)
                 if checks > dyn_limit:
                     break
                 # Strict tail anchor may fail on ASR typos in the final word.
                 # Fall back to regular scanning instead of hard-failing.
 
             for k in cand:
-                i = self.cursor
                 step = max(1, k // (10 if aggressive else 6))
-                while i + k <= len(self.words):
+                starts = range(self.cursor, len(self.word_texts) - k + 1, step)
+                # score windows in growing blocks; the first window over threshold wins,
+                # exactly as in a window-by-window scan
+                pos = 0
+                block = 8
+                while pos < len(starts):
                     if checks > dyn_limit:
                         break
-                    win_tokens = self.word_texts[i:i + k]
-                    win = " ".join(win_tokens)
-                    score = _best_score(s.norm, win)
-                    checks += 1
-                    if score < score_threshold and s_compact:
-                        win_compact = _compact_for_match(win)
-                        if win_compact:
-                            score = max(score, _best_score(s_compact, win_compact))
-                    if score >= score_threshold:
-                        end_idx = _end_idx_from_matches(win_tokens, i, i + k)
-                        st0 = int(round(self.words[i].start * 1000))
-                        en0 = int(round(self.words[end_idx - 1].end * 1000))
-                        st = max(st0, self.last_end_ms + 1)
-                        en = max(en0, st)
-                        if (en - st) < MIN_MATCH_MS:
-                            en = st + MIN_MATCH_MS
-                        # src_win остаётся как было (или будет форсирован выше)
-                        src_win = None
-                        return st, en, src_win, end_idx
-
-                    i += step
+                    blk = starts[pos:pos + min(block, dyn_limit + 1 - checks)]
+                    wins = [self._window_str(i, i + k) for i in blk]
+                    hit = _first_window_hit(
+                        s.norm, s_compact, wins, score_threshold,
+                        lambda b: "".join(self.word_compacts[blk[b]:blk[b] + k]))
+                    if hit < 0:
+                        checks += len(blk)
+                        pos += len(blk)
+                        block = min(block * 2, 256)
+                        continue
+                    checks += hit + 1
+                    return self._window_hit(blk[hit], k, _end_idx_from_matches)
         return None
 
+    def _window_hit(self, i: int, k: int, end_idx_from_matches: Callable[[List[str], int, int], int]
+                    ) -> Tuple[int, int, Optional[str], int]:
+        win_tokens = self.word_texts[i:i + k]
+        end_idx = end_idx_from_matches(win_tokens, i, i + k)
+        st0 = self.word_start_ms[i]
+        en0 = self.word_end_ms[end_idx - 1]
+        st = max(st0, self.last_end_ms + 1)
+        en = max(en0, st)
+        if (en - st) < MIN_MATCH_MS:
+            en = st + MIN_MATCH_MS
+        # src_win остаётся как было (или будет форсирован выше)
+        return st, en, None, end_idx
+
     def _try_match_sentence(self, s: Sentence, aggressive: bool) -> bool:
         hit = self._try_match_sentence_core(s, aggressive)
         if hit is None:
@@ -1488,41 +1931,55 @@ class IncrementalAligner:
 
         self.last_start_ms = st
         self.last_end_ms = en  # NEW: track previous end for monotonicity
-        self.cursor = min(len(self.words), max(self.cursor, end_idx))
+        self.cursor = min(len(self.word_texts), max(self.cursor, end_idx))
         self.sent_idx += 1
         return True
 
-    def extend_words_and_align(self, new_words: List[Word], src: Optional[str] = None,
+    def extend_words_and_align(self, new_words: Iterable[Word], src: Optional[str] = None,
                                aggressive: bool = False) -> List[Tuple[Sentence, Optional[int], Optional[int], Optional[str]]]:
         start_len = len(self.results)
         # NEW: replace words for this src instead of blindly appending duplicates
         if src is not None and self.word_srcs:
-            keep_w: List[Word] = []
+            keep_ws: List[float] = []
+            keep_we: List[float] = []
             keep_t: List[str] = []
+            keep_c: List[str] = []
             keep_s: List[Optional[str]] = []
-            for w, t, sname in zip(self.words, self.word_texts, self.word_srcs):
+            keep_st: List[int] = []
+            keep_en: List[int] = []
+            for ws, we, t, c, sname, st_ms, en_ms in zip(self.word_start_s, self.word_end_s, self.word_texts,
+                                                         self.word_compacts, self.word_srcs,
+                                                         self.word_start_ms, self.word_end_ms):
                 if sname != src:
-                    keep_w.append(w); keep_t.append(t); keep_s.append(sname)
-            if len(keep_w) != len(self.words):
-                self.words = keep_w
+                    keep_ws.append(ws); keep_we.append(we)
+                    keep_t.append(t); keep_c.append(c); keep_s.append(sname)
+                    keep_st.append(st_ms); keep_en.append(en_ms)
+            if len(keep_t) != len(self.word_texts):
+                self.word_start_s = keep_ws
+                self.word_end_s = keep_we
                 self.word_texts = keep_t
+                self.word_compacts = keep_c
                 self.word_srcs = keep_s
+                self.word_start_ms = keep_st
+                self.word_end_ms = keep_en
+                self.compact_tail_index = {}
+                for pos, c in enumerate(keep_c):
+                    if c:
+                        self.compact_tail_index.setdefault(c, []).append(pos)
+                self.word_end_ms_max = list(itertools.accumulate(keep_en, max))
+                self._rebuild_joined()
                 # after removal, ensure cursor is not past the new pointer for last_end_ms
-                self.cursor = min(len(self.words), self._ptr_for_time(self.last_end_ms + 1))
+                self.cursor = min(len(self.word_texts), self._ptr_for_time(self.last_end_ms + 1))
 
-        before = len(self.words)
-        for w in new_words:
-            self.words.append(w)
-            self.word_texts.append(unidecode(w.text.lower()))
-            self.word_srcs.append(src)
-        eprint(f"[+w] +{len(self.words) - before} T={len(self.words)}")
+        before = len(self.word_texts)
+        self._append_words(new_words if isinstance(new_words, Words) else Words.from_iter(new_words), src)
+        eprint(f"[+w] +{len(self.word_texts) - before} T={len(self.word_texts)}")
 
         while self.sent_idx < len(self.sentences):
             if self.stop_idx is not None and self.sent_idx >= self.stop_idx:
                 break
             s = self.sentences[self.sent_idx]
-            meta = getattr(s, "meta", None)
-            if meta and meta.get("placeholder"):
+            if s.placeholder:
                 self.results.append((s, None, None, None))
                 self.sent_idx += 1
                 continue
@@ -1532,6 +1989,202 @@ class IncrementalAligner:
 
         return self.results[start_len:]
 
+# -------- alignment fallbacks --------
+
+class _ResultsTally:
+    """Running per-file last end and ms-per-char totals over an aligner's results.
+
+    results only grow; each query folds in the entries appended since the previous
+    one. The single in-place edit (the last entry in _approximate_missing_chunk)
+    always hits an entry appended after the last query, so nothing goes stale.
+    """
+    __slots__ = ("last_end_by_src", "last_end_scanned", "avg_total_ms", "avg_total_chars", "avg_scanned")
+
+    def __init__(self):
+        self.last_end_by_src: Dict[Optional[str], int] = {}
+        self.last_end_scanned = 0
+        self.avg_total_ms = 0
+        self.avg_total_chars = 0
+        self.avg_scanned = 0
+
+    def last_end_ms_for_file(self, results_list, fname: str, file_start_ms: int) -> int:
+        by_src = self.last_end_by_src
+        if self.last_end_scanned > len(results_list):
+            by_src.clear()
+            self.last_end_scanned = 0
+        for _s, st, en, src in results_list[self.last_end_scanned:]:
+            if en is not None:
+                prev = by_src.get(src)
+                if prev is None or en > prev:
+                    by_src[src] = en
+        self.last_end_scanned = len(results_list)
+        last = by_src.get(fname)
+        return last if last is not None and last > file_start_ms else file_start_ms
+
+    def avg_ms_per_char(self, results_list) -> Optional[float]:
+        if self.avg_scanned > len(results_list):
+            self.avg_total_ms = self.avg_total_chars = self.avg_scanned = 0
+        total_ms = self.avg_total_ms
+        total_chars = self.avg_total_chars
+        for _s, st, en, _src in results_list[self.avg_scanned:]:
+            if st is None or en is None:
+                continue
+            txt = (_s.text or "").strip() if _s is not None else ""
+            if not txt:
+                continue
+            dur = max(0, int(en) - int(st))
+            if dur <= 0:
+                continue
+            total_ms += dur
+            total_chars += len(txt)
+        self.avg_total_ms = total_ms
+        self.avg_total_chars = total_chars
+        self.avg_scanned = len(results_list)
+        if total_chars <= 0:
+            return None
+        return total_ms / total_chars
+
+
+def _weighted_durations(total_ms: int, weights: List[int], min_each: int) -> List[int]:
+    n = len(weights)
+    if n == 0:
+        return []
+    if total_ms <= 0:
+        return [0] * n
+    min_each_f = float(min_each)
+    if total_ms < min_each_f * n:
+        min_each_f = total_ms / n
+    w = np.asarray(weights, dtype=np.float64)
+    weight_sum = float(w.sum()) or 1.0
+    remaining = max(0.0, total_ms - (min_each_f * n))
+    raw = min_each_f + remaining * (w / weight_sum)
+    arr = np.rint(raw).astype(np.int64)
+    # fix rounding drift: the |diff| sentences whose rounding lost (diff > 0) or
+    # gained (diff < 0) the most get one ms back; |diff| <= n/2, and a rounded-up
+    # value is >= 1, so nothing goes negative
+    diff = int(round(total_ms - int(arr.sum())))
+    if diff:
+        order = np.argsort(raw - arr, kind="stable")
+        if diff > 0:
+            arr[order[n - diff:]] += 1
+        else:
+            arr[order[:-diff]] -= 1
+    np.maximum(arr, 1, out=arr)
+    out = arr.tolist()
+    total = sum(out)
+    if total != total_ms:
+        out[-1] += (total_ms - total)
+    return out
+
+
+def _approximate_missing_chunk(aligner_obj: IncrementalAligner,
+                               tally: _ResultsTally,
+                               sentences_list: List[Sentence],
+                               chunk_end_idx: Optional[int],
+                               audio_name: str,
+                               file_start_ms: int,
+                               file_end_ms: int) -> bool:
+    if chunk_end_idx is None:
+        return False
+    start_idx = aligner_obj.sent_idx
+    if start_idx >= chunk_end_idx:
+        return False
+    last_end = tally.last_end_ms_for_file(aligner_obj.results, audio_name, file_start_ms)
+    base_start = max(file_start_ms, last_end + 1)
+    if base_start > file_end_ms:
+        base_start = file_end_ms
+    remaining_ms = max(0, file_end_ms - base_start)
+    pending = range(start_idx, min(chunk_end_idx, len(sentences_list)))
+    if not pending:
+        return False
+    weights = [sentences_list[i].norm_len for i in pending]
+    weight_total = sum(weights)
+    avg = tally.avg_ms_per_char(aligner_obj.results)
+    if avg is None or avg <= 0:
+        avg = remaining_ms / max(1, weight_total)
+    expected = avg * weight_total
+    if expected > 0 and abs(expected - remaining_ms) > max(1000, expected * 0.5):
+        eprint(f"[fallback] warn: expected {expected:.0f}ms, remaining {remaining_ms}ms")
+    durs = _weighted_durations(remaining_ms, weights, MIN_MATCH_MS)
+    cur = base_start
+    for i, dur in zip(pending, durs):
+        st = cur
+        en = cur + dur
+        aligner_obj.results.append((sentences_list[i], st, en, audio_name))
+        cur = en
+    # force last end to file end
+    if aligner_obj.results:
+        s_last, st_last, _en_last, src_last = aligner_obj.results[-1]
+        aligner_obj.results[-1] = (s_last, st_last, file_end_ms, src_last)
+        cur = file_end_ms
+    aligner_obj.sent_idx = chunk_end_idx
+    if aligner_obj.results:
+        aligner_obj.last_start_ms = aligner_obj.results[-1][1]
+        aligner_obj.last_end_ms = aligner_obj.results[-1][2]
+        aligner_obj.cursor = aligner_obj._ptr_for_time(aligner_obj.last_end_ms + 1)
+    eprint(f"[fallback] approx timings for idx {start_idx}-{chunk_end_idx - 1} in {audio_name}")
+    return True
+
+
+def _recover_with_anchor(aligner_obj: IncrementalAligner,
+                         tally: _ResultsTally,
+                         sentences_list: List[Sentence],
+                         chunk_end_idx: Optional[int],
+                         audio_name: str,
+                         file_start_ms: int,
+                         file_end_ms: int,
+                         lookahead: int = RECOVER_LOOKAHEAD_SENTENCES) -> bool:
+    if chunk_end_idx is None:
+        return False
+    start_idx = aligner_obj.sent_idx
+    if start_idx >= chunk_end_idx:
+        return False
+    max_idx = min(chunk_end_idx, start_idx + max(1, lookahead) + 1)
+    anchor_hit = None  # (idx, (st,en,src,end_idx))
+    for j in range(start_idx + 1, max_idx):
+        hit = aligner_obj._try_match_sentence_core(sentences_list[j], aggressive=True)
+        if hit is not None:
+            anchor_hit = (j, hit)
+            break
+    if anchor_hit is None:
+        return False
+    anchor_idx, (st, en, _src_win, end_idx) = anchor_hit
+    if st is None or en is None:
+        return False
+    last_end = tally.last_end_ms_for_file(aligner_obj.results, audio_name, file_start_ms)
+    base_start = max(file_start_ms, last_end + 1)
+    anchor_start = max(base_start, st)
+    pending = range(start_idx, anchor_idx)  # anchor_idx < len(sentences_list)
+    if pending:
+        min_total = MIN_MATCH_MS * len(pending)
+        if (anchor_start - base_start) < min_total:
+            anchor_start = min(file_end_ms, base_start + min_total)
+        gap_ms = max(0, anchor_start - base_start)
+        weights = [sentences_list[i].norm_len for i in pending]
+        durs = _weighted_durations(gap_ms, weights, MIN_MATCH_MS)
+        cur = base_start
+        for i, dur in zip(pending, durs):
+            st_i = cur
+            en_i = cur + dur
+            aligner_obj.results.append((sentences_list[i], st_i, en_i, audio_name))
+            cur = en_i
+    else:
+        cur = base_start
+    # commit anchor using ASR match, but keep monotonicity
+    st = max(anchor_start, st, cur)
+    en = max(en, st + MIN_MATCH_MS)
+    if en > file_end_ms:
+        en = file_end_ms
+        if en < st:
+            st = max(file_start_ms, en - MIN_MATCH_MS)
+    aligner_obj.results.append((sentences_list[anchor_idx], st, en, audio_name))
+    aligner_obj.sent_idx = anchor_idx + 1
+    aligner_obj.last_start_ms = st
+    aligner_obj.last_end_ms = en
+    aligner_obj.cursor = min(len(aligner_obj.word_texts), max(aligner_obj.cursor, end_idx))
+    eprint(f"[recover] anchor idx={anchor_idx} after gap {start_idx}-{anchor_idx - 1} in {audio_name}")
+    return True
+
 # -------- JSON writing (items pretty + tokens inline) --------
 
 def _normalize_text(s: str) -> str:
@@ -1546,23 +2199,6 @@ def _build_item(idx: int, sentence_obj: Sentence, start_ms, end_ms, src):
     tokens = getattr(sentence_obj, "tokens", None)
     if tokens is None:
         tokens = text.split()
-    meta = getattr(sentence_obj, "meta", {}) if sentence_obj is not None else {}
-    merged_with = None
-    pre_merged_text = None
-    order = None
-    suborder = None
-    chunk = None
-    if isinstance(meta, dict):
-        merged_with = meta.get("merged_into")
-        pre_merged_text = meta.get("pre_merged_text")
-        if "order" in meta:
-            order = meta.get("order")
-        if "suborder" in meta:
-            suborder = meta.get("suborder")
-        if "chunk" in meta:
-            chunk = meta.get("chunk")
-    if pre_merged_text is None:
-        pre_merged_text = None  # explicitly null when not merged
     item = {
         "idx": idx,
         "text": text,
@@ -1571,13 +2207,13 @@ def _build_item(idx: int, sentence_obj: Sentence, start_ms, end_ms, src):
         "start_ms": int(start_ms) if start_ms is not None else None,
         "end_ms": int(end_ms) if end_ms is not None else None,
         "audio_file": src,
-        "merged_with": merged_with,
-        "preMergedText": pre_merged_text
+        "merged_with": sentence_obj.merged_into,
+        "preMergedText": sentence_obj.pre_merged_text,  # null when not merged
+        # always present, default null
+        "order": sentence_obj.order,
+        "suborder": sentence_obj.suborder,
+        "chunk": sentence_obj.chunk,
     }
-    # always present, default null
-    item["order"] = order
-    item["suborder"] = suborder
-    item["chunk"] = chunk
     return item
 
 
@@ -1640,7 +2276,7 @@ def _fail_alignment_and_exit(out_path: Path,
             problem_text = ""
     progress["unrecognized_text"] = problem_text
     _sync_progress_meta(meta, aligner.results, sentences, status="error")
-    save_progress_json(out_path, aligner.results, meta, sentences)
+    save_progress_json(out_path, aligner.results, meta, sentences, final=True)
     finish(False)
 
 
@@ -1648,45 +2284,118 @@ def _fail_alignment_and_exit(out_path: Path,
 def _progress_sidecar_path(out_path: Path) -> Path:
     return out_path.with_name(out_path.stem + "Progress" + out_path.suffix)
 
-def _prepare_meta_for_write(meta: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+def _prepare_meta_for_write(meta: Dict[str, Any]) -> Dict[str, Any]:
     meta_out: Dict[str, Any] = dict(meta) if isinstance(meta, dict) else {}
-    placeholders: Dict[str, str] = {}
     meta_out.pop("processed_audio_totals", None)
-    processed = meta_out.get("processed_audio")
-    if isinstance(processed, list):
-        compact: List[Any] = []
-        for i, entry in enumerate(processed):
-            if isinstance(entry, (list, tuple)):
-                ph = f"__PROC_AUDIO_INLINE_{i}__"
-                placeholders[ph] = json.dumps(list(entry), ensure_ascii=False)
-                compact.append(ph)
-            else:
-                compact.append(entry)
-        meta_out["processed_audio"] = compact
-    return meta_out, placeholders
+    meta_out.pop("_processed_audio_normalized", None)
+    return meta_out
+
+
+def _render_meta(meta_out: Dict[str, Any], indent: str) -> str:
+    """Pretty-print meta at the given indent (as json.dumps(indent=2) would inside the
+    payload), with each processed_audio row on one line."""
+    if not meta_out:
+        return "{}"
+    inner = indent + "  "
+    fields = []
+    for key, value in meta_out.items():
+        if key == "processed_audio" and isinstance(value, list) and value:
+            row_indent = inner + "  "
+            rows = [row_indent + ("[" + ", ".join(_json_dumps(v) for v in entry) + "]"
+                                  if isinstance(entry, (list, tuple))
+                                  else _json_dumps(entry, pretty=True).replace("\n", "\n" + row_indent))
+                    for entry in value]
+            val = "[\n" + ",\n".join(rows) + "\n" + inner + "]"
+        else:
+            val = _json_dumps(value, pretty=True).replace("\n", "\n" + inner)
+        fields.append(inner + _json_dumps(key) + ": " + val)
+    return "{\n" + ",\n".join(fields) + "\n" + indent + "}"
+
+
+def _progress_meta_bytes(meta_text: str) -> bytes:
+    return _disk_bytes('{\n  "meta": ' + meta_text + "\n}")
 
 
 def _write_progress_meta(out_path: Path, meta: Dict[str, Any]) -> None:
-    progress_path = _progress_sidecar_path(out_path)
-    meta_out, placeholders = _prepare_meta_for_write(meta)
-    payload = {"meta": meta_out}
-    text = json.dumps(payload, ensure_ascii=False, indent=2)
-    for ph, arr in placeholders.items():
-        text = text.replace(f"\"{ph}\"", arr)
-    tmp = progress_path.with_suffix(progress_path.suffix + ".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        f.write(text)
-    _atomic_replace_with_retry(tmp, progress_path)
-
-
-def _atomic_replace_with_retry(src: Path, dst: Path, retries: int = 40, base_sleep: float = 0.05) -> None:
+    _wait_pending_write()  # a queued save would overwrite this sidecar with older meta
+    meta_text = _render_meta(_prepare_meta_for_write(meta), "  ")
+    _write_file_atomic(_progress_sidecar_path(out_path), [_progress_meta_bytes(meta_text)])
+
+
+def _disk_bytes(text: str) -> bytes:
+    """UTF-8 bytes exactly as a text-mode write would put them on disk (os.linesep newlines)."""
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+
+def _os_write_all(fd: int, data) -> None:
+    with memoryview(data) as view:
+        off = 0
+        while off < len(view):
+            off += os.write(fd, view[off:])
+
+
+def _write_file_atomic(path: Path, chunks: Iterable[bytes]) -> None:
+    """Write the chunks to "<path>.tmp" with raw os.write calls (batched to ~1 MiB),
+    fsync it, then replace path, so readers never see a half-written file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        buf = bytearray()
+        for chunk in chunks:
+            buf += chunk
+            if len(buf) >= 1 << 20:
+                _os_write_all(fd, buf)
+                buf.clear()
+        _os_write_all(fd, buf)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    _atomic_replace_with_retry(tmp, path)
+
+
+_MOVEFILE_REPLACE_EXISTING = 0x1
+_MOVEFILE_WRITE_THROUGH = 0x8
+_MOVE_FILE_EX: List[Any] = []  # [MoveFileExW or None], resolved on first use
+
+
+def _move_file_ex():
+    if not _MOVE_FILE_EX:
+        fn = None
+        if sys.platform == "win32":
+            try:
+                from ctypes import wintypes
+                fn = ctypes.WinDLL("kernel32", use_last_error=True).MoveFileExW
+                fn.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD)
+                fn.restype = wintypes.BOOL
+            except Exception:
+                fn = None
+        _MOVE_FILE_EX.append(fn)
+    return _MOVE_FILE_EX[0]
+
+
+def _atomic_replace_with_retry(src: Path, dst: Path, retries: int = 40, base_sleep: float = 0.01) -> None:
     """
     Windows-safe atomic replace:
     when another process reads dst (scp/sftp), os.replace may temporarily fail
     with sharing/access errors. Retry briefly instead of failing whole run.
+    On Windows MoveFileExW(REPLACE_EXISTING | WRITE_THROUGH) is tried first;
+    retries back off exponentially with a little jitter, capped at 0.25s.
     """
+    move_file_ex = _move_file_ex()
     last_exc: Optional[BaseException] = None
     for i in range(max(1, retries)):
+        if move_file_ex is not None:
+            if move_file_ex(str(src), str(dst), _MOVEFILE_REPLACE_EXISTING | _MOVEFILE_WRITE_THROUGH):
+                return
+            err = ctypes.get_last_error()
+            # 5 = access denied, 32 = sharing violation
+            if err in (5, 32):
+                last_exc = ctypes.WinError(err)
+                time.sleep(min(0.25, base_sleep * (1 << min(i, 5)) + random.random() * 0.005))
+                continue
+            # anything else: let os.replace report (or handle) it
         try:
             os.replace(src, dst)
             return
@@ -1698,111 +2407,361 @@ def _atomic_replace_with_retry(src: Path, dst: Path, retries: int = 40, base_sle
                 last_exc = exc
             else:
                 raise
-        time.sleep(min(0.25, base_sleep * (1.0 + 0.15 * i)))
+        time.sleep(min(0.25, base_sleep * (1 << min(i, 5)) + random.random() * 0.005))
     if last_exc is not None:
         raise last_exc
     os.replace(src, dst)
 
 
+def _render_item(item: Dict[str, Any], indent: str) -> str:
+    """One pretty-printed item at the given indent, with tokens on one line."""
+    inner = indent + "  "
+    fields = []
+    for key, value in item.items():
+        if key == "tokens":
+            val = _json_dumps(value)
+        else:
+            val = _json_dumps(value, pretty=True).replace("\n", "\n" + inner)
+        fields.append(inner + _json_dumps(key) + ": " + val)
+    return indent + "{\n" + ",\n".join(fields) + "\n" + indent + "}"
+
+
+# Background transcript writes (save_progress_json(background=True)): the items are
+# rendered on the calling thread; the transcript and then its Progress sidecar are
+# written on one writer thread. At most one write is in flight and the next save
+# waits for it. A failed write is logged (to the real log stream, see eprint) as soon
+# as it happens and makes finish() report false; the next save rewrites both files.
+_WRITE_POOL: Optional[ThreadPoolExecutor] = None
+_WRITE_PENDING: Optional[Future] = None
+_WRITE_FAILED = False
+_WRITE_REPORTED: Optional[Future] = None  # last failed write already logged
+_WRITE_REPORT_LOCK = threading.Lock()
+
+
+def _write_progress_files(out_path: Path, chunks: List[bytes], meta_bytes: bytes) -> None:
+    # transcript first: the sidecar must never claim progress the transcript lacks
+    _write_file_atomic(out_path, chunks)
+    _write_file_atomic(_progress_sidecar_path(out_path), [meta_bytes])
+
+
+def _on_write_done(fut: Future) -> None:
+    """Log a failed write once and mark the run failed. Runs as the done-callback and
+    again from _wait_pending_write: waiters wake before callbacks run, so finish() must
+    not reach os._exit before the report is written."""
+    global _WRITE_FAILED, _WRITE_REPORTED
+    exc = fut.exception()
+    if exc is None:
+        return
+    with _WRITE_REPORT_LOCK:
+        _WRITE_FAILED = True
+        if _WRITE_REPORTED is not fut:
+            _WRITE_REPORTED = fut
+            eprint(f"[save!] background write failed: {exc}")
+
+
+def _wait_pending_write() -> None:
+    """Block until the in-flight background write (if any) is done; never raises."""
+    global _WRITE_PENDING
+    fut, _WRITE_PENDING = _WRITE_PENDING, None
+    if fut is not None:
+        _on_write_done(fut)
+
+
 def save_progress_json(out_path: Path,
                        results: List[Tuple[Sentence, Optional[int], Optional[int], Optional[str]]],
                        meta: Dict[str, Any],
-                       sentences_all: List[Sentence]) -> None:
+                       sentences_all: List[Sentence],
+                       background: bool = False,
+                       final: bool = False) -> None:
     """
     Пишем {"meta": {...}, "items": [...]} с pretty-print (indent=2),
     при этом МАССИВ tokens — всегда в одну строку.
     В items кладём ВСЕ предложения из исходного текста, даже те, у которых ещё нет таймингов.
+    background=True returns once the bytes are rendered and leaves the disk write to
+    the writer thread (see _WRITE_PENDING). final=True marks the last save of the run
+    and frees the per-item render cache instead of refreshing it.
     """
+    global _WRITE_POOL, _WRITE_PENDING
+    _wait_pending_write()
     out_path.parent.mkdir(parents=True, exist_ok=True)
     _sync_progress_meta(meta, results, sentences_all)
-    _write_progress_meta(out_path, meta)
 
-    meta_info, meta_placeholders = _prepare_meta_for_write(meta)
+    meta_info = _prepare_meta_for_write(meta)
     existing_items = _load_existing_items(out_path)
 
-    # Построим индекс таймингов по позициям предложений
-    times: Dict[int, Tuple[Optional[int], Optional[int], Optional[str]]] = {}
     # results идут в порядке предложений, поэтому их индекс = позиция
-    for i, (sent, st, en, src) in enumerate(results):
-        times[i] = (st, en, src)
-
-    items: List[Dict[str, Any]] = []
+    n_results = len(results)
+
+    # Same layout as json.dumps({"meta": ..., "items": ...}, indent=2), written
+    # item by item so the whole document is never joined into one string
+    meta_text = _render_meta(meta_info, "  ")
+    item_sep = _disk_bytes(",\n")
+    # cached item blobs are shared, so this is a list of references, not a copy
+    chunks: List[bytes] = [_disk_bytes('{\n  "meta": ' + meta_text + ',\n  "items": ')]
+    key = str(out_path)
+    prev_rendered = _ITEM_JSON_CACHE.pop(key, [])
+    rendered: List[Optional[_ItemRender]] = [None] * len(sentences_all)
+    timings: List[_SavedTiming] = [None] * len(sentences_all)
     last_end_ms: Optional[int] = None
     last_audio_file: Optional[str] = None
     for i, sent in enumerate(sentences_all):
-        st, en, src = times.get(i, (None, None, None))
+        if i < n_results:
+            _, st, en, src = results[i]
+        else:
+            st = en = src = None
         if st is None and existing_items and i < len(existing_items):
             prev = existing_items[i]
-            if isinstance(prev, dict):
-                prev_text = (prev.get("text") or "").strip()
-                if prev_text and prev_text == sent.text.strip():
-                    prev_st = prev.get("start_ms")
-                    if prev_st is not None:
-                        st = prev_st
-                        en = prev.get("end_ms")
-                        src = prev.get("audio_file")
-        sent_meta = getattr(sent, "meta", None)
-        is_placeholder = isinstance(sent_meta, dict) and sent_meta.get("placeholder") is True
+            if prev is not None and prev[0] == sent.text.strip():
+                _, st, en, src = prev
+        is_placeholder = sent.placeholder is True
         if st is None and is_placeholder and last_end_ms is not None:
             st = last_end_ms
             en = last_end_ms
             if src is None:
                 src = last_audio_file
-        items.append(_build_item(i, sent, st, en, src))
-        if items[-1].get("end_ms") is not None:
-            last_end_ms = items[-1]["end_ms"]
-            if items[-1].get("audio_file"):
-                last_audio_file = items[-1]["audio_file"]
-
-    # Плейсхолдеры для компактных tokens
-    placeholders: Dict[str, str] = {}
-    placeholders.update(meta_placeholders)
-    for i, it in enumerate(items):
-        ph = f"__TOKENS_INLINE_{i}__"
-        tokens_inline = json.dumps(it["tokens"], ensure_ascii=False, separators=(',', ':'))
-        placeholders[ph] = tokens_inline
-        it["tokens"] = ph
-
-    payload = {"meta": meta_info, "items": items}
-
-    text = json.dumps(payload, ensure_ascii=False, indent=2)
-    for ph, arr in placeholders.items():
-        text = text.replace(f"\"{ph}\"", arr)
-
-    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        f.write(text)
-    _atomic_replace_with_retry(tmp, out_path)
-    _SAVE_ITEMS_CACHE[str(out_path)] = items
+        # everything _build_item reads; unchanged sentences reuse last save's JSON
+        sig = (i, st, en, src, sent.text, id(sent.tokens), len(sent.tokens or ()), sent.merged_into,
+               sent.pre_merged_text, sent.order, sent.suborder, sent.chunk)
+        hit = prev_rendered[i] if i < len(prev_rendered) else None
+        if hit is not None and hit[1] is sent.tokens and hit[0] == sig:
+            entry = hit
+        else:
+            item = _build_item(i, sent, st, en, src)
+            entry = (sig, sent.tokens, _saved_timing(item), item["end_ms"], item["audio_file"],
+                     _disk_bytes(_render_item(item, "    ")))
+        rendered[i] = entry
+        _, _, timings[i], item_end, item_audio, blob = entry
+        chunks.append(item_sep if i else _disk_bytes("[\n"))
+        chunks.append(blob)
+        if item_end is not None:
+            last_end_ms = item_end
+            if item_audio:
+                last_audio_file = item_audio
+
+    chunks.append(_disk_bytes("\n  ]\n}" if timings else "[]\n}"))
+    if background:
+        if _WRITE_POOL is None:
+            _WRITE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress-writer")
+        _WRITE_PENDING = _WRITE_POOL.submit(_write_progress_files, out_path, chunks,
+                                            _progress_meta_bytes(meta_text))
+        _WRITE_PENDING.add_done_callback(_on_write_done)
+    else:
+        _write_progress_files(out_path, chunks, _progress_meta_bytes(meta_text))
+    _EXISTING_CACHE.pop(key, None)
+    _SAVE_ITEMS_CACHE[key] = timings
+    if not final:
+        _ITEM_JSON_CACHE[key] = rendered
+    _save_duration_cache(out_path)
 
 # -------- resume helpers --------
 
+# "<path>|<mtime_ns>|<size>" -> duration in seconds. Persisted next to the output so a
+# resume does not fork ffprobe again for every audio that was already processed.
+_DUR_CACHE: Dict[str, float] = {}
+_DUR_CACHE_LOCK = threading.Lock()
+_DUR_CACHE_DIRTY = False
+
+
+def _duration_cache_path(out_path: Path) -> Path:
+    return out_path.with_name(out_path.name + ".durcache.json")
+
+
+def _load_duration_cache(out_path: Path) -> None:
+    try:
+        data = _json_load_path(_duration_cache_path(out_path))
+    except Exception:
+        return
+    if not isinstance(data, dict):
+        return
+    with _DUR_CACHE_LOCK:
+        for k, v in data.items():
+            if isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0:
+                _DUR_CACHE.setdefault(k, float(v))
+
+
+def _save_duration_cache(out_path: Path) -> None:
+    global _DUR_CACHE_DIRTY
+    with _DUR_CACHE_LOCK:
+        if not _DUR_CACHE_DIRTY:
+            return
+        text = _json_dumps(_DUR_CACHE)
+        _DUR_CACHE_DIRTY = False
+    try:
+        _write_file_atomic(_duration_cache_path(out_path), [text.encode("utf-8")])
+    except Exception as e:
+        eprint(f"[durcache] write failed: {e}")
+
+
+_FFPROBE_DURATION_ARGS = ("-v", "error", "-show_entries", "format=duration", "-print_format", "csv=p=0")
+
+
+def _wave_duration_seconds(p: Path) -> float:
+    """Length of a .wav from its header (stdlib, no fork); 0.0 for other files or on error."""
+    import wave
+    if p.suffix.lower() != ".wav":
+        return 0.0
+    try:
+        with wave.open(str(p), "rb") as wf:
+            frames = wf.getnframes(); rate = wf.getframerate()
+            if rate > 0:
+                dur = frames / float(rate)
+                if dur > 0: return dur
+    except Exception:
+        pass
+    return 0.0
+
+
+def _probe_duration_seconds(p: Path) -> float:
+    """Audio length via the wave header for .wav, else ffprobe; 0.0 if unknown."""
+    import subprocess
+    dur = _wave_duration_seconds(p)
+    if dur > 0:
+        return dur
+    try:
+        cmd = ["ffprobe", *_FFPROBE_DURATION_ARGS, str(p)]
+        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True)
+        dur = float(out.strip())
+        if dur > 0: return dur
+    except Exception:
+        pass
+    return 0.0
+
+
+def _duration_cache_key(p: Path) -> Optional[str]:
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return f"{p}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _cached_duration(key: Optional[str]) -> Optional[float]:
+    if key is None:
+        return None
+    with _DUR_CACHE_LOCK:
+        return _DUR_CACHE.get(key)
+
+
+def _store_duration(key: Optional[str], dur: float) -> None:
+    global _DUR_CACHE_DIRTY
+    if key is None or dur <= 0:
+        return
+    with _DUR_CACHE_LOCK:
+        _DUR_CACHE[key] = dur
+        _DUR_CACHE_DIRTY = True
+
+
+def _actual_duration_seconds(p: Path, fallback: float) -> float:
+    key = _duration_cache_key(p)
+    dur = _cached_duration(key)
+    if dur is not None:
+        return dur
+    dur = _probe_duration_seconds(p)
+    if dur > 0:
+        _store_duration(key, dur)
+        return dur
+    return float(fallback or 0.0)
+
+
+async def _ffprobe_durations_async(paths: List[Path]) -> List[float]:
+    """ffprobe every path as concurrent subprocesses (at most cpu_count at once); 0.0 on failure."""
+    sem = asyncio.Semaphore(max(1, os.cpu_count() or 4))
+
+    async def _probe(p: Path) -> float:
+        async with sem:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "ffprobe", *_FFPROBE_DURATION_ARGS, str(p),
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+                out, _ = await proc.communicate()
+                if proc.returncode != 0:
+                    return 0.0
+                dur = float(out.decode("utf-8", "replace").strip())
+                return dur if dur > 0 else 0.0
+            except Exception:
+                return 0.0
+
+    return await asyncio.gather(*(_probe(p) for p in paths))
+
+
+def _probe_durations_bulk(paths: List[Path]) -> Dict[str, float]:
+    """str(path) -> duration (0.0 if unknown). Cache hits and .wav headers are read
+    inline; the remaining files go through one asyncio ffprobe fan-out."""
+    out: Dict[str, float] = {}
+    misses: Dict[str, Tuple[Path, Optional[str]]] = {}
+    for p in paths:
+        name = str(p)
+        if name in out or name in misses:
+            continue
+        key = _duration_cache_key(p)
+        dur = _cached_duration(key)
+        if dur is None:
+            dur = _wave_duration_seconds(p)
+            if dur <= 0:
+                misses[name] = (p, key)
+                continue
+            _store_duration(key, dur)
+        out[name] = dur
+    if misses:
+        pending = list(misses.values())
+        durs = asyncio.run(_ffprobe_durations_async([p for p, _key in pending]))
+        for (p, key), dur in zip(pending, durs):
+            _store_duration(key, dur)
+            out[str(p)] = dur
+    return out
+
+
+@functools.lru_cache(maxsize=50_000)
+def _tok_cached(text: str) -> Tuple[str, ...]:
+    return _tokenize_cached(norm_text(text))
+
+
+class _Sent:
+    """Light sentence stand-in for resumed items; tokens are computed on first access."""
+    __slots__ = ("text", "_tokens")
+
+    def __init__(self, t, toks=None):
+        self.text = t
+        self._tokens = toks or None
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokens = list(_tok_cached(self.text))
+        return self._tokens
+
+
 def _load_existing(out_path: Path):
-    if not out_path.exists() or out_path.stat().st_size == 0:
+    try:
+        raw = _read_progress_bytes(out_path)
+    except OSError:
+        return None
+    if not raw:
         return None
     try:
-        with out_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _json_load_bytes(raw)
     except Exception:
         return None
     if not isinstance(data, dict) or "meta" not in data:
         return None
 
     unified: List[Tuple[Any, Optional[int], Optional[int], Optional[str]]] = []
+    items_by_audio: Dict[str, List[int]] = {}  # audio_file -> item positions
     if isinstance(data.get("items"), list):
-        class _Sent:
-            __slots__ = ("text", "tokens")
-            def __init__(self, t, toks=None): self.text = t; self.tokens = toks or tokenize_words(norm_text(t))
-        for it in data["items"]:
+        for pos, it in enumerate(data["items"]):
             text = it.get("text", "")
             st = it.get("start_ms", None)
             en = it.get("end_ms", None)
             src = it.get("audio_file", None)
+            if isinstance(src, str):
+                src = sys.intern(src)
+                items_by_audio.setdefault(src, []).append(pos)
             unified.append((_Sent(text), st, en, src))
     elif isinstance(data.get("results"), list):
         unified = data["results"]
 
     data["__results_unified__"] = unified
+    data["__items_by_audio__"] = items_by_audio
     return data
 
 
@@ -1838,12 +2797,24 @@ def _load_processed_audio_totals(meta: Dict[str, Any]) -> Dict[str, float]:
 
 
 def _normalize_processed_audio_list(meta: Dict[str, Any],
-                                    processed_raw: List[Any]) -> List[List[Any]]:
+                                    processed_raw: Iterable[Any]) -> List[List[Any]]:
+    """Normalized [name, last, total] copy of processed_raw, which is only read; an
+    already-normalized list comes back as the same object."""
+    # "_processed_audio_normalized" (in-memory only, dropped on write) holds the length
+    # of the last list that came out of here unchanged, i.e. a fixed point: running
+    # again would rebuild the same entries and totals. _record_processed_audio clears it
+    if (isinstance(processed_raw, list)
+            and meta.get("_processed_audio_normalized") == len(processed_raw)
+            and all(isinstance(e, list) and len(e) == 3 and isinstance(e[0], str) and e[0]
+                    for e in processed_raw)):
+        return processed_raw
     totals = _load_processed_audio_totals(meta)
     out: List[List[Any]] = []
+    fixed_point = True
     for entry in processed_raw:
         name = _processed_audio_name(entry)
         if not name:
+            fixed_point = False
             continue
         last = 0.0
         total = totals.get(name, 0.0)
@@ -1858,7 +2829,12 @@ def _normalize_processed_audio_list(meta: Dict[str, Any],
             total = last
         totals[name] = max(totals.get(name, 0.0), total)
         out.append([name, round(last, 2), round(total, 2)])
+        fixed_point = fixed_point and entry == out[-1]
     meta["processed_audio_totals"] = totals
+    if fixed_point:
+        meta["_processed_audio_normalized"] = len(out)
+    else:
+        meta.pop("_processed_audio_normalized", None)
     return out
 
 
@@ -1872,6 +2848,7 @@ def _record_processed_audio(meta: Dict[str, Any], name: str, attempt_sec: float)
     meta["processed_audio"].append([name, round(attempt_sec, 2), round(total, 2)])
     totals[name] = total
     meta["processed_audio_totals"] = totals
+    meta.pop("_processed_audio_normalized", None)
 
 
 def _sanitize_processed_audio(existing: Dict[str, Any]) -> None:
@@ -1879,7 +2856,7 @@ def _sanitize_processed_audio(existing: Dict[str, Any]) -> None:
     items = existing.get("items")
     if not isinstance(meta, dict) or not isinstance(items, list):
         return
-    processed = _normalize_processed_audio_list(meta, list(meta.get("processed_audio") or []))
+    processed = _normalize_processed_audio_list(meta, meta.get("processed_audio") or [])
     meta["processed_audio"] = processed
     if not processed:
         # Rebuild from items when meta is missing/empty.
@@ -1893,23 +2870,24 @@ def _sanitize_processed_audio(existing: Dict[str, Any]) -> None:
                 seen.add(name)
         if ordered:
             meta["processed_audio"] = ordered
+            meta.pop("_processed_audio_normalized", None)
             progress = meta.get("progress")
             if isinstance(progress, dict):
                 progress["last_audio"] = ordered[-1][0]
                 progress["audios_done"] = len(ordered)
         return
 
-    last_audio = None
-    for it in items:
-        name = it.get("audio_file")
-        if name and it.get("end_ms") is not None:
-            last_audio = name
+    # last timed item: scan from the end and stop at the first hit
+    last_audio = next((it.get("audio_file") for it in reversed(items)
+                       if it.get("audio_file") and it.get("end_ms") is not None), None)
 
-    processed_names = _processed_audio_names(processed)
+    # normalized entries are [name, last, total]; cut after the first attempt of last_audio
+    cut = -1 if last_audio is None else next(
+        (i for i, entry in enumerate(processed) if entry[0] == last_audio), -1)
     if last_audio is None:
         meta["processed_audio"] = []
-    elif last_audio in processed_names:
-        meta["processed_audio"] = processed[:processed_names.index(last_audio) + 1]
+    elif cut >= 0:
+        meta["processed_audio"] = processed[:cut + 1]
     else:
         seen = set()
         ordered = []
@@ -1920,6 +2898,8 @@ def _sanitize_processed_audio(existing: Dict[str, Any]) -> None:
                 ordered.append([name, 0.0, round(totals.get(name, 0.0), 2)])
                 seen.add(name)
         meta["processed_audio"] = ordered
+    if cut != len(processed) - 1:
+        meta.pop("_processed_audio_normalized", None)  # list was cut or rebuilt
 
     progress = meta.get("progress")
     if isinstance(progress, dict):
@@ -1932,7 +2912,7 @@ def _rewind_last_audio(existing: Dict[str, Any]) -> Optional[str]:
     meta = existing.get("meta")
     if not isinstance(meta, dict):
         return None
-    processed_audio = _normalize_processed_audio_list(meta, list(meta.get("processed_audio") or []))
+    processed_audio = _normalize_processed_audio_list(meta, meta.get("processed_audio") or [])
     if not processed_audio:
         return None
     last_entry = processed_audio.pop()
@@ -1940,11 +2920,15 @@ def _rewind_last_audio(existing: Dict[str, Any]) -> Optional[str]:
     meta["processed_audio"] = processed_audio
     items = existing.get("items")
     if last_audio and isinstance(items, list):
-        for it in items:
-            if it.get("audio_file") == last_audio:
-                it["start_ms"] = None
-                it["end_ms"] = None
-                it["audio_file"] = None
+        by_audio = existing.get("__items_by_audio__")
+        if isinstance(by_audio, dict):
+            hits = [items[pos] for pos in by_audio.pop(last_audio, [])]
+        else:
+            hits = [it for it in items if it.get("audio_file") == last_audio]
+        for it in hits:
+            it["start_ms"] = None
+            it["end_ms"] = None
+            it["audio_file"] = None
     return last_audio
 
 
@@ -1964,34 +2948,32 @@ def _append_null_and_exit(out_path: Path, aligner, sentences, meta):
 
 def _prime_from_existing(existing: Dict[str, Any],
                          sentences: List[Sentence],
-                         aligner: IncrementalAligner
+                         aligner: IncrementalAligner,
+                         sent_strip: Optional[List[str]] = None
                          ) -> Tuple[int, List[List[Any]], float]:
     items = existing.get("items") or []
     meta = existing.get("meta", {})
     if not isinstance(meta, dict):
         meta = {}
-    processed_audio = _normalize_processed_audio_list(
-        meta,
-        list(meta.get("processed_audio") or [])
-    )
+    processed_audio = _normalize_processed_audio_list(meta, meta.get("processed_audio") or [])
     progress = meta.get("progress") or {}
     running_offset = float(progress.get("total_duration_sec") or 0.0)
 
+    if sent_strip is None:
+        sent_strip = [s.text.strip() for s in sentences]
     k = 0
-    for k in range(min(len(items), len(sentences))):
-        if (items[k].get("text") or "").strip() != sentences[k].text.strip():
+    for it, s_text in zip(items, sent_strip):
+        if (it.get("text") or "").strip() != s_text:
             break
-        st = items[k].get("start_ms")
-        en = items[k].get("end_ms")
-        src = items[k].get("audio_file")
+        st = it.get("start_ms")
         if st is None:
             break
+        en = it.get("end_ms")
         en_eff = int(en) if en is not None else int(st)
-        aligner.results.append((sentences[k], int(st), en_eff, src))
+        aligner.results.append((sentences[k], int(st), en_eff, it.get("audio_file")))
         aligner.last_start_ms = int(st)
         aligner.last_end_ms = en_eff
-    else:
-        k = min(len(items), len(sentences))
+        k += 1
     aligner.sent_idx = k
     # ensure cursor is aligned to last_end boundary
     aligner.cursor = aligner._ptr_for_time(aligner.last_end_ms + 1)
@@ -2002,6 +2984,13 @@ def _prime_from_existing(existing: Dict[str, Any],
 # -------- path to transcript --------
 
 def _build_output_path(mainFolderPath: Path, channelName: str, videoFolderName: str) -> Path:
+    return Path(_build_output_path_cached(str(mainFolderPath), str(channelName), str(videoFolderName)))
+
+
+# The lookup creates any missing directory it settles on, so the answer stays valid
+# for the run (the error handlers in main resolve the same path again).
+@functools.lru_cache(maxsize=64)
+def _build_output_path_cached(mainFolderPath: str, channelName: str, videoFolderName: str) -> str:
     video_root_candidates = [
         Path(mainFolderPath) / channelName / videoFolderName,
         Path(mainFolderPath) / channelName / "VIDEOS" / videoFolderName,
@@ -2026,17 +3015,17 @@ def _build_output_path(mainFolderPath: Path, channelName: str, videoFolderName:
 
     out_path = transcript_dir / f"{videoFolderName}_transcript.json"
     eprint(f"[path] transcript -> {out_path}")
-    return out_path
+    return str(out_path)
 
 
 # -------- textParts helpers --------
-_BRACKET_TAG_RE = re.compile(r"\[[^][]*\]")
 
+@functools.lru_cache(maxsize=256)
 def _clean_asr_prompt(text: str, max_chars: int) -> str:
     if not text:
         return ""
     text = _BRACKET_TAG_RE.sub("", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _collapse_ws(text)
     if max_chars and max_chars > 0 and len(text) > max_chars:
         text = text[:max_chars].rstrip()
     return text
@@ -2045,8 +3034,7 @@ _TEXT_PART_FIELD = "textForVoiceover"
 def _read_json_from_path_or_url(path_or_url: str) -> Any:
     try:
         if isinstance(path_or_url, (Path, )):
-            with open(str(path_or_url), "r", encoding="utf-8") as fh:
-                return json.load(fh)
+            return _json_load_path(path_or_url)
         url = str(path_or_url)
         from urllib.parse import urlparse
         if urlparse(url).scheme in ("http", "https"):
@@ -2054,39 +3042,48 @@ def _read_json_from_path_or_url(path_or_url: str) -> Any:
             with urlopen(url) as resp:
                 data = resp.read()
             try:
-                return json.loads(data.decode("utf-8"))
+                return _json_load_bytes(data)
             except Exception:
                 return json.loads(data.decode("cp1251", errors="ignore"))
         else:
-            with open(url, "r", encoding="utf-8") as fh:
-                return json.load(fh)
+            return _json_load_path(Path(url))
     except Exception as exc:
         eprint(f"[textParts] load failed: {exc}")
         return None
 
-def _iter_textparts(obj: Any):
-    """Deep traversal: gather strings from 'textForVoiceover' fields located inside arrays of dicts."""
-    if isinstance(obj, dict):
-        if _TEXT_PART_FIELD in obj and isinstance(obj[_TEXT_PART_FIELD], str):
-            yield obj[_TEXT_PART_FIELD]
-        for v in obj.values():
-            yield from _iter_textparts(v)
-    elif isinstance(obj, list):
-        for el in obj:
-            if isinstance(el, dict) and _TEXT_PART_FIELD in el and isinstance(el[_TEXT_PART_FIELD], str):
-                yield el[_TEXT_PART_FIELD]
-            else:
-                yield from _iter_textparts(el)
+def _iter_textparts(obj: Any) -> List[str]:
+    """Deep traversal: gather strings from 'textForVoiceover' fields located inside arrays of dicts.
+    A dict inside an array that carries the field is taken as a leaf (not descended into).
+    Explicit stack in document order; strings on the stack are results ready to emit."""
+    out: List[str] = []
+    stack: List[Any] = [obj] if isinstance(obj, (dict, list)) else []
+    while stack:
+        x = stack.pop()
+        if isinstance(x, str):
+            out.append(x)
+        elif isinstance(x, dict):
+            v = x.get(_TEXT_PART_FIELD)
+            if isinstance(v, str):
+                out.append(v)
+            stack.extend(c for c in reversed(list(x.values())) if isinstance(c, (dict, list)))
+        elif isinstance(x, list):
+            for el in reversed(x):
+                if isinstance(el, dict):
+                    v = el.get(_TEXT_PART_FIELD)
+                    stack.append(v if isinstance(v, str) else el)
+                elif isinstance(el, list):
+                    stack.append(el)
+    return out
 
 def _load_text_parts(textPartsPath: str) -> list[str]:
     data = _read_json_from_path_or_url(textPartsPath)
     if data is None:
         return []
-    parts = [s for s in _iter_textparts(data) if isinstance(s, str)]
+    parts = _iter_textparts(data)
     cleaned = []
     for s in parts:
         s = _BRACKET_TAG_RE.sub("", s)
-        s = re.sub(r"\s+", " ", s).strip()
+        s = _collapse_ws(s)
         cleaned.append(s)
     return cleaned
 
@@ -2106,6 +3103,8 @@ def _load_manga_text_parts(path: str) -> List[Dict[str, Any]]:
 
     collected: List[Tuple[int, int, str]] = []
     seq = 0
+    is_sorted = True  # orders seen so far are non-decreasing
+    prev_ord: Optional[int] = None
     for idx, item in enumerate(tree):
         if not isinstance(item, dict):
             continue
@@ -2124,16 +3123,21 @@ def _load_manga_text_parts(path: str) -> List[Dict[str, Any]]:
                 continue
             if not isinstance(txt, str):
                 continue
-            t_clean = re.sub(r"\s+", " ", txt).strip()
+            t_clean = _collapse_ws(txt)
             if not t_clean:
                 continue
+            if prev_ord is not None and ord_val < prev_ord:
+                is_sorted = False
+            prev_ord = ord_val
             collected.append((ord_val, seq, t_clean))
             seq += 1
 
     if not collected:
         return []
 
-    collected.sort(key=lambda t: (t[0], t[1]))
+    # seq grows with position, so a stable sort on order alone equals sorting by (order, seq)
+    if not is_sorted:
+        collected.sort(key=lambda t: t[0])
     ordered = [{"text": txt, "order": ord_val} for ord_val, _seq, txt in collected]
     eprint(f"[manga] ordered parts: {len(ordered)}")
     return ordered
@@ -2170,22 +3174,26 @@ def _split_manga_parts_by_files(parts: List[Dict[str, Any]], text_blocks: List[s
             stream.append((" ", None))  # separator between parts
         stream.append((txt, ord_val))
 
+    # offsets[k] = position of stream[k] in the concatenated stream; a chunk is the
+    # next len(chunk_txt) characters, cut into one slice per segment it crosses
+    offsets = list(itertools.accumulate((len(seg_text) for seg_text, _ in stream), initial=0))
+    total = offsets[-1]
     out: List[Dict[str, Any]] = []
     chunk_ranges: List[Tuple[int, int]] = []
-    seg_idx = 0
-    seg_pos = 0
+    pos = 0
     order_counters: Dict[int, int] = {}
 
     for chunk_idx, chunk_txt in enumerate(chunk_texts):
-        remaining = len(chunk_txt)
         start_idx = len(out)
-        while remaining > 0 and seg_idx < len(stream):
+        end = min(pos + len(chunk_txt), total)
+        seg_idx = bisect.bisect_right(offsets, pos) - 1
+        while pos < end:
             seg_text, seg_order = stream[seg_idx]
-            available = len(seg_text) - seg_pos
-            take = min(available, remaining)
-            slice_text = seg_text[seg_pos:seg_pos + take]
+            seg_start = offsets[seg_idx]
+            stop = min(end, offsets[seg_idx + 1])
+            slice_text = seg_text[pos - seg_start:stop - seg_start]
             # пропускаем чистые пробелы, чтобы не появлялись пустые предложения
-            if slice_text.strip():
+            if not slice_text.isspace():
                 if seg_order is not None:
                     sub = order_counters.get(seg_order, 0)
                     order_counters[seg_order] = sub + 1
@@ -2197,16 +3205,14 @@ def _split_manga_parts_by_files(parts: List[Dict[str, Any]], text_blocks: List[s
                     "suborder": sub,
                     "chunk": chunk_idx,
                 })
-            remaining -= take
-            seg_pos += take
-            if seg_pos >= len(seg_text):
-                seg_idx += 1
-                seg_pos = 0
+            pos = stop
+            seg_idx += 1
         end_idx = len(out)
         chunk_ranges.append((start_idx, end_idx))
 
-    if seg_idx < len(stream):
-        eprint(f"[manga] warn: {len(stream) - seg_idx} segments not consumed by chunking")  # pragma: no cover
+    if pos < total:
+        left = len(stream) - (bisect.bisect_right(offsets, pos) - 1)
+        eprint(f"[manga] warn: {left} segments not consumed by chunking")  # pragma: no cover
     return out, chunk_ranges
 
 
@@ -2230,12 +3236,18 @@ class TextPartsManager:
                 chunk = None
             self.parts.append(txt)
             self.part_meta.append({"order": order, "suborder": suborder, "chunk": chunk})
+        self._stripped: List[str] = [(p or "").strip() for p in self.parts]
+        self._strip_len: List[int] = [len(p) for p in self._stripped]
         self.min_chars = max(0, int(min_chars or 0))
         self.prefix_children: List[List[int]] = [[] for _ in parts]
         self.suffix_children: List[List[int]] = [[] for _ in parts]
         self.attached_to: List[Optional[int]] = [None] * len(parts)
         self.merged_into: List[Optional[int]] = [None] * len(parts)
         self.attach_mode: List[Optional[str]] = [None] * len(parts)
+        # doubly-linked list of carriers (parts not attached to another part);
+        # -1 and len(parts) are the head/tail sentinels
+        self._prev_c: List[int] = list(range(-1, len(parts) - 1))
+        self._next_c: List[int] = list(range(1, len(parts) + 1))
         self._initial_merge()
 
     def _initial_merge(self) -> None:
@@ -2246,12 +3258,12 @@ class TextPartsManager:
                 idx += 1
                 continue
             carrier = idx
-            total_len = len((self.parts[idx] or "").strip())
+            total_len = self._strip_len[idx]
             idx += 1
             while idx < n:
                 if self.part_meta[idx].get("chunk") != self.part_meta[carrier].get("chunk"):
                     break
-                next_len = len((self.parts[idx] or "").strip())
+                next_len = self._strip_len[idx]
                 # Основной критерий: наращиваем, пока суммарно не дотянули до min_chars
                 if total_len < self.min_chars:
                     self._attach_suffix(idx, carrier)
@@ -2268,25 +3280,40 @@ class TextPartsManager:
                 # Иначе остановка на границе нормального размера
                 break
 
+    # An attached part always sits between two neighbouring carriers and is attached
+    # to one of them, so its neighbours follow from its own carrier's links.
     def _find_previous_carrier(self, idx: int) -> Optional[int]:
-        for j in range(idx - 1, -1, -1):
-            if self.attached_to[j] is None:
-                return j
-        return None
+        anchor = self.attached_to[idx]
+        if anchor is not None and anchor < idx:
+            return anchor
+        j = self._prev_c[idx if anchor is None else anchor]
+        return j if j >= 0 else None
 
     def _find_next_carrier(self, idx: int) -> Optional[int]:
-        for j in range(idx + 1, len(self.parts)):
-            if self.attached_to[j] is None:
-                return j
-        return None
+        anchor = self.attached_to[idx]
+        if anchor is not None and anchor > idx:
+            return anchor
+        j = self._next_c[idx if anchor is None else anchor]
+        return j if j < len(self.parts) else None
+
+    def _unlink_carrier(self, idx: int) -> None:
+        if self.attached_to[idx] is not None:
+            return
+        prev_c, next_c = self._prev_c[idx], self._next_c[idx]
+        if prev_c >= 0:
+            self._next_c[prev_c] = next_c
+        if next_c < len(self.parts):
+            self._prev_c[next_c] = prev_c
 
     def _attach_suffix(self, child_idx: int, target_idx: int) -> None:
+        self._unlink_carrier(child_idx)
         self.suffix_children[target_idx].append(child_idx)
         self.attached_to[child_idx] = target_idx
         self.attach_mode[child_idx] = "suffix"
         self.merged_into[child_idx] = target_idx
 
     def _attach_prefix(self, child_idx: int, target_idx: int, front: bool = False) -> None:
+        self._unlink_carrier(child_idx)
         lst = self.prefix_children[target_idx]
         if front:
             lst.insert(0, child_idx)
@@ -2297,43 +3324,40 @@ class TextPartsManager:
         self.merged_into[child_idx] = target_idx
 
     def _compose_text(self, idx: int) -> str:
-        parts: List[str] = []
-        for child in self.prefix_children[idx]:
-            parts.append(self.parts[child])
-        parts.append(self.parts[idx])
-        for child in self.suffix_children[idx]:
-            parts.append(self.parts[child])
-        return " ".join(p for p in parts if p).strip()
+        # stripped parts only differ in whitespace runs, which make_sentence collapses
+        stripped = self._stripped
+        parts = [stripped[child] for child in self.prefix_children[idx]]
+        parts.append(stripped[idx])
+        parts.extend(stripped[child] for child in self.suffix_children[idx])
+        return " ".join(p for p in parts if p)
 
     def _make_real_sentence(self, idx: int) -> Sentence:
         text = self._compose_text(idx)
         sent = make_sentence(text) if text else Sentence("", "", [])
+        sent.pre_merged_text = self.parts[idx]
+        sent.order = self.part_meta[idx].get("order")
+        sent.suborder = self.part_meta[idx].get("suborder")
+        sent.chunk = self.part_meta[idx].get("chunk")
         sent.meta = {
-            "placeholder": False,
             "text_part_index": idx,
             "prefix_children": list(self.prefix_children[idx]),
             "suffix_children": list(self.suffix_children[idx]),
-            "merged_into": None,
-            "pre_merged_text": self.parts[idx],
-            "order": self.part_meta[idx].get("order"),
-            "suborder": self.part_meta[idx].get("suborder"),
-            "chunk": self.part_meta[idx].get("chunk"),
         }
         return sent
 
     def _make_placeholder_sentence(self, idx: int) -> Sentence:
         sent = Sentence("", "", [])
+        sent.placeholder = True
+        sent.merged_into = self.merged_into[idx]
+        sent.pre_merged_text = self.parts[idx]
+        sent.order = self.part_meta[idx].get("order")
+        sent.suborder = self.part_meta[idx].get("suborder")
+        sent.chunk = self.part_meta[idx].get("chunk")
         sent.meta = {
-            "placeholder": True,
             "text_part_index": idx,
             "attached_to": self.attached_to[idx],
             "attachment_mode": self.attach_mode[idx],
             "original_text": self.parts[idx],
-            "merged_into": self.merged_into[idx],
-            "pre_merged_text": self.parts[idx],
-            "order": self.part_meta[idx].get("order"),
-            "suborder": self.part_meta[idx].get("suborder"),
-            "chunk": self.part_meta[idx].get("chunk"),
         }
         return sent
 
@@ -2360,18 +3384,11 @@ class TextPartsManager:
     def shift_suffix_to_next(self, idx: int, sentences: List[Sentence]) -> Optional[int]:
         if not self.has_suffix_attachment(idx):
             return None
-        child_idx = self.suffix_children[idx].pop(0)
-        self.attached_to[child_idx] = None
-        self.attach_mode[child_idx] = None
-        self.merged_into[child_idx] = None
+        child_idx = self.suffix_children[idx][0]
         target = self._find_next_carrier(child_idx)
         if target is None:
-            # revert to previous state
-            self.suffix_children[idx].insert(0, child_idx)
-            self.attached_to[child_idx] = idx
-            self.attach_mode[child_idx] = "suffix"
-            self.merged_into[child_idx] = idx
             return None
+        self.suffix_children[idx].pop(0)
         self._attach_prefix(child_idx, target, front=True)
         self.refresh_sentence(idx, sentences)
         self.refresh_sentence(target, sentences)
@@ -2416,6 +3433,9 @@ def main():
 
     try:
         audios = scan_audio(args.mainFolderPath, args.channelName, args.videoFolderName)
+        # file names, read off the paths once (interned: shared by every word/result of a file)
+        audio_names = [sys.intern(a.path.name) for a in audios]
+        audio_by_name: Dict[str, AudioItem] = dict(zip(audio_names, audios))
         texts  = scan_texts(args.mainFolderPath, args.channelName, args.videoFolderName, args.textFileName)
 
         out_path = Path(args.outFilePath) if args.outFilePath else _build_output_path(
@@ -2499,33 +3519,7 @@ def main():
         aligner = IncrementalAligner(sentences, min_score=75, max_checks=4000, dynamic_factor=20,
                                      text_parts_manager=text_parts_manager)
 
-        # helper точной длительности
-        def _actual_duration_seconds(p: Path, fallback: float) -> float:
-            import subprocess, wave
-            try:
-                cmd = [
-                    "ffprobe",
-                    "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-of", "default=nw=1:nk=1",
-                    str(p),
-                ]
-                out = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True)
-                dur = float(out.strip())
-                if dur > 0: return dur
-            except Exception:
-                pass
-            try:
-                if p.suffix.lower() == ".wav":
-                    with wave.open(str(p), "rb") as wf:
-                        frames = wf.getnframes(); rate = wf.getframerate()
-                        if rate > 0:
-                            dur = frames / float(rate)
-                            if dur > 0: return dur
-            except Exception:
-                pass
-            return float(fallback or 0.0)
-
+        _load_duration_cache(out_path)
         running_offset = 0.0
         existing = _load_existing(out_path)
         skip_audio_names: set[str] = set()
@@ -2535,7 +3529,8 @@ def main():
             rewound_audio = _rewind_last_audio(existing)
             if rewound_audio:
                 eprint(f"[resume] rewind last audio: {rewound_audio}")
-            skipped, processed_audio, running_offset = _prime_from_existing(existing, sentences, aligner)
+            skipped, processed_audio, running_offset = _prime_from_existing(
+                existing, sentences, aligner, [s.text.strip() for s in sentences])
             meta.update(existing.get("meta", {}))
             meta["num_sentences_total"] = len(sentences)
             meta["processed_audio"] = processed_audio
@@ -2549,11 +3544,10 @@ def main():
             running_offset = 0.0
             processed_audio_names = _processed_audio_names(processed_audio)
             if processed_audio_names:
-                audio_by_name = {a.path.name: a.path for a in audios}
-                for name in processed_audio_names:
-                    p = audio_by_name.get(name)
-                    if p:
-                        running_offset += _actual_duration_seconds(p, 0.0)
+                done_paths = [audio_by_name[name].path for name in processed_audio_names if name in audio_by_name]
+                durations = _probe_durations_bulk(done_paths)
+                running_offset = float(np.fromiter((durations[str(p)] for p in done_paths),
+                                                   dtype=np.float64, count=len(done_paths)).sum())
             meta["progress"]["total_duration_sec"] = running_offset
             meta["progress"]["audios_done"] = len(processed_audio)
             meta["progress"]["last_audio"] = processed_audio_names[-1] if processed_audio_names else None
@@ -2571,175 +3565,26 @@ def main():
             if not audios: eprint("[warn] no audio")
             if not sentences: eprint("[warn] no text")
             _sync_progress_meta(meta, aligner.results, sentences, status="error")
-            save_progress_json(out_path, aligner.results, meta, sentences)
+            save_progress_json(out_path, aligner.results, meta, sentences, final=True)
             finish(False)
 
         # ---- Основной проход по аудиофайлам с удержанием границ файла ----
         MARGIN_MS = 1500  # 6 секунд допуск на паузы
 
-        def _last_end_ms_for_file(results_list, fname: str, file_start_ms: int) -> int:
-            last = file_start_ms
-            for _s, st, en, src in results_list:
-                if src == fname and en is not None:
-                    if en > last: last = en
-            return last
-        def _avg_ms_per_char(results_list) -> Optional[float]:
-            total_ms = 0
-            total_chars = 0
-            for _s, st, en, _src in results_list:
-                if st is None or en is None:
-                    continue
-                txt = (_s.text or "").strip() if _s is not None else ""
-                if not txt:
-                    continue
-                dur = max(0, int(en) - int(st))
-                if dur <= 0:
-                    continue
-                total_ms += dur
-                total_chars += len(txt)
-            if total_chars <= 0:
-                return None
-            return total_ms / total_chars
-
-        def _weighted_durations(total_ms: int, weights: List[int], min_each: int) -> List[int]:
-            n = len(weights)
-            if n == 0:
-                return []
-            if total_ms <= 0:
-                return [0] * n
-            min_each_f = float(min_each)
-            if total_ms < min_each_f * n:
-                min_each_f = total_ms / n
-            weight_sum = float(sum(weights)) or 1.0
-            remaining = max(0.0, total_ms - (min_each_f * n))
-            raw = [min_each_f + (remaining * (w / weight_sum)) for w in weights]
-            out = [int(round(x)) for x in raw]
-            # fix rounding drift
-            diff = int(round(total_ms - sum(out)))
-            if diff != 0:
-                step = 1 if diff > 0 else -1
-                i = 0
-                while diff != 0 and i < n * 2:
-                    idx = i % n
-                    if out[idx] + step >= 0:
-                        out[idx] += step
-                        diff -= step
-                    i += 1
-            if total_ms > 0:
-                for i in range(n):
-                    if out[i] < 1:
-                        out[i] = 1
-                total = sum(out)
-                if total != total_ms:
-                    out[-1] += (total_ms - total)
-            return out
-
-        def _approximate_missing_chunk(aligner_obj: IncrementalAligner,
-                                       sentences_list: List[Sentence],
-                                       chunk_end_idx: Optional[int],
-                                       audio_name: str,
-                                       file_start_ms: int,
-                                       file_end_ms: int) -> bool:
-            if chunk_end_idx is None:
-                return False
-            start_idx = aligner_obj.sent_idx
-            if start_idx >= chunk_end_idx:
-                return False
-            last_end = _last_end_ms_for_file(aligner_obj.results, audio_name, file_start_ms)
-            base_start = max(file_start_ms, last_end + 1)
-            if base_start > file_end_ms:
-                base_start = file_end_ms
-            remaining_ms = max(0, file_end_ms - base_start)
-            pending = sentences_list[start_idx:chunk_end_idx]
-            if not pending:
-                return False
-            weights = [max(1, len((s.text or "").strip())) for s in pending]
-            avg = _avg_ms_per_char(aligner_obj.results)
-            if avg is None or avg <= 0:
-                avg = remaining_ms / max(1, sum(weights))
-            expected = avg * sum(weights)
-            if expected > 0 and abs(expected - remaining_ms) > max(1000, expected * 0.5):
-                eprint(f"[fallback] warn: expected {expected:.0f}ms, remaining {remaining_ms}ms")
-            durs = _weighted_durations(remaining_ms, weights, MIN_MATCH_MS)
-            cur = base_start
-            for s, dur in zip(pending, durs):
-                st = cur
-                en = cur + dur
-                aligner_obj.results.append((s, st, en, audio_name))
-                cur = en
-            # force last end to file end
-            if aligner_obj.results:
-                s_last, st_last, _en_last, src_last = aligner_obj.results[-1]
-                aligner_obj.results[-1] = (s_last, st_last, file_end_ms, src_last)
-                cur = file_end_ms
-            aligner_obj.sent_idx = chunk_end_idx
-            if aligner_obj.results:
-                aligner_obj.last_start_ms = aligner_obj.results[-1][1]
-                aligner_obj.last_end_ms = aligner_obj.results[-1][2]
-                aligner_obj.cursor = aligner_obj._ptr_for_time(aligner_obj.last_end_ms + 1)
-            eprint(f"[fallback] approx timings for idx {start_idx}-{chunk_end_idx - 1} in {audio_name}")
-            return True
+        last_flush_ts: Optional[float] = None
 
-        def _recover_with_anchor(aligner_obj: IncrementalAligner,
-                                 sentences_list: List[Sentence],
-                                 chunk_end_idx: Optional[int],
-                                 audio_name: str,
-                                 file_start_ms: int,
-                                 file_end_ms: int,
-                                 lookahead: int = RECOVER_LOOKAHEAD_SENTENCES) -> bool:
-            if chunk_end_idx is None:
-                return False
-            start_idx = aligner_obj.sent_idx
-            if start_idx >= chunk_end_idx:
-                return False
-            max_idx = min(chunk_end_idx, start_idx + max(1, lookahead) + 1)
-            anchor_hit = None  # (idx, (st,en,src,end_idx))
-            for j in range(start_idx + 1, max_idx):
-                hit = aligner_obj._try_match_sentence_core(sentences_list[j], aggressive=True)
-                if hit is not None:
-                    anchor_hit = (j, hit)
-                    break
-            if anchor_hit is None:
-                return False
-            anchor_idx, (st, en, _src_win, end_idx) = anchor_hit
-            if st is None or en is None:
-                return False
-            last_end = _last_end_ms_for_file(aligner_obj.results, audio_name, file_start_ms)
-            base_start = max(file_start_ms, last_end + 1)
-            anchor_start = max(base_start, st)
-            pending = sentences_list[start_idx:anchor_idx]
-            if pending:
-                min_total = MIN_MATCH_MS * len(pending)
-                if (anchor_start - base_start) < min_total:
-                    anchor_start = min(file_end_ms, base_start + min_total)
-                gap_ms = max(0, anchor_start - base_start)
-                weights = [max(1, len((s.text or "").strip())) for s in pending]
-                durs = _weighted_durations(gap_ms, weights, MIN_MATCH_MS)
-                cur = base_start
-                for s, dur in zip(pending, durs):
-                    st_i = cur
-                    en_i = cur + dur
-                    aligner_obj.results.append((s, st_i, en_i, audio_name))
-                    cur = en_i
-            else:
-                cur = base_start
-            # commit anchor using ASR match, but keep monotonicity
-            st = max(anchor_start, st, cur)
-            en = max(en, st + MIN_MATCH_MS)
-            if en > file_end_ms:
-                en = file_end_ms
-                if en < st:
-                    st = max(file_start_ms, en - MIN_MATCH_MS)
-            aligner_obj.results.append((sentences_list[anchor_idx], st, en, audio_name))
-            aligner_obj.sent_idx = anchor_idx + 1
-            aligner_obj.last_start_ms = st
-            aligner_obj.last_end_ms = en
-            aligner_obj.cursor = min(len(aligner_obj.words), max(aligner_obj.cursor, end_idx))
-            eprint(f"[recover] anchor idx={anchor_idx} after gap {start_idx}-{anchor_idx - 1} in {audio_name}")
-            return True
+        def _save_progress_debounced() -> None:
+            # mid-file saves only; the per-file save and every exit path write unconditionally
+            nonlocal last_flush_ts
+            now = time.monotonic()
+            if last_flush_ts is None or now - last_flush_ts >= FLUSH_INTERVAL_SEC:
+                save_progress_json(out_path, aligner.results, meta, sentences, background=True)
+                last_flush_ts = now
+
+        results_tally = _ResultsTally()
 
         asr_workers_requested = max(1, int(args.asrWorkers or 1))
-        jobs_pending_total = sum(1 for a in audios if a.path.name not in skip_audio_names)
+        jobs_pending_total = sum(1 for nm in audio_names if nm not in skip_audio_names)
         worker_slots = max(1, min(asr_workers_requested, jobs_pending_total or 1))
         if worker_slots > 1:
             if worker_slots != asr_workers_requested:
@@ -2762,15 +3607,21 @@ def main():
             return prompt if prompt else None
 
         def _run_asr_job(audio_item: AudioItem, prompt: Optional[str]):
-            if min_free_vram_bytes > 0 and args.device == "cuda":
-                _wait_for_min_vram(min_free_vram_bytes)
             start_ts = time.time()
-            words, lang, asr_dur = transcribe_words(audio_item.path, args.device, args.language, prompt=prompt)
+            words, lang, asr_dur = transcribe_words(audio_item.path, args.device, args.language, prompt=prompt,
+                                                    min_free_vram=min_free_vram_bytes)
             asr_time = max(0.0, time.time() - start_ts)
-            real_dur = _actual_duration_seconds(audio_item.path, asr_dur)
+            if _TRUST_ASR_DURATION and asr_dur > 0.5:
+                real_dur = asr_dur
+            else:
+                real_dur = _actual_duration_seconds(audio_item.path, asr_dur)
             return {"words": words, "language": lang, "real_duration": real_dur, "asr_time": asr_time}
 
-        with ThreadPoolExecutor(max_workers=worker_slots) as executor:
+        # one job per stage slot plus one more, so a file can transcribe while another
+        # aligns; every queued job holds a decoded waveform, so keep decode-ahead small
+        _configure_asr_stages(worker_slots)
+        pipeline_depth = worker_slots + 1
+        with ThreadPoolExecutor(max_workers=pipeline_depth) as executor:
             pending: Dict[str, Tuple[AudioItem, Any]] = {}
             next_submit_idx = 0
 
@@ -2778,17 +3629,19 @@ def main():
                 nonlocal next_submit_idx
                 if worker_slots <= 0:
                     return
-                while len(pending) < worker_slots and next_submit_idx < len(audios):
+                while len(pending) < pipeline_depth and next_submit_idx < len(audios):
                     idx0 = next_submit_idx
                     candidate = audios[idx0]
+                    candidate_name = audio_names[idx0]
                     next_submit_idx += 1
-                    if candidate.path.name in skip_audio_names:
+                    if candidate_name in skip_audio_names:
                         continue
                     prompt = _prompt_for_index(idx0)
-                    pending[candidate.path.name] = (candidate, executor.submit(_run_asr_job, candidate, prompt))
+                    pending[candidate_name] = (candidate, executor.submit(_run_asr_job, candidate, prompt))
 
             _fill_pending()
             for idx, a in enumerate(audios, 1):
+                audio_name = audio_names[idx - 1]
                 _fill_pending()
                 # �᫨ �ᯮ��㥬 ����: i-� 䠩� ����砥� ᢮� �������� �।�������
                 if chunk_ranges and (idx - 1) < len(chunk_ranges):
@@ -2796,26 +3649,27 @@ def main():
                 else:
                     chunk_start, chunk_end = None, None
 
-                if a.path.name in skip_audio_names:
+                if audio_name in skip_audio_names:
                     meta["progress"]["audios_done"] = idx
-                    meta["progress"]["last_audio"] = a.path.name
+                    meta["progress"]["last_audio"] = audio_name
                     meta["progress"]["total_duration_sec"] = running_offset
                     _sync_progress_meta(meta, aligner.results, sentences, status="processing")
                     _write_progress_meta(out_path, meta)
                     continue
 
-                job_pair = pending.pop(a.path.name, None)
+                job_pair = pending.pop(audio_name, None)
                 if job_pair is None:
                     prompt = _prompt_for_index(idx - 1)
                     job_pair = (a, executor.submit(_run_asr_job, a, prompt))
                 file_start_sent_idx = aligner.sent_idx
 
                 # �ਢ�뢠�� ⠩����� � ⥪�饬� 䠩�� (��᫥ �஢�ન ᪨��)
-                aligner.forced_src = a.path.name
+                aligner.forced_src = audio_name
                 aligner.stop_idx  = chunk_end
 
-                eprint(f"[run] {idx}/{len(audios)} {a.path.name}")
+                eprint(f"[run] {idx}/{len(audios)} {audio_name}")
                 job_result = job_pair[1].result()
+                _fill_pending()  # the next job transcribes while this file is aligned and saved
                 words = job_result["words"]
                 lang = job_result["language"]
                 real_dur = job_result["real_duration"]
@@ -2824,24 +3678,24 @@ def main():
                     meta["language"] = lang
                 # heard_preview = _summarize_words(words, limit=40)
                 heard_preview = _summarize_words(words)
-                eprint(f"[heard] {a.path.name}: {heard_preview}")
+                eprint(f"[heard] {audio_name}: {heard_preview}")
 
                 file_start_sec = running_offset
                 file_start_ms = int(round(file_start_sec * 1000))
                 file_end_ms = int(round((file_start_sec + real_dur) * 1000))
 
                 # ��ࢠ� ����� ᫮�
-                shifted = [Word(w.text, w.start + file_start_sec, w.end + file_start_sec) for w in words]
+                shifted = words.shifted(file_start_sec)
                 # Use last ASR word time to tolerate trailing silence at file end.
                 last_word_end_ms = file_start_ms
                 if shifted:
-                    last_word_end_ms = int(round(shifted[-1].end * 1000))
+                    last_word_end_ms = int(round(float(shifted.end[-1]) * 1000))
                 prev_sent_idx = aligner.sent_idx
-                added = aligner.extend_words_and_align(shifted, src=a.path.name, aggressive=False)
+                added = aligner.extend_words_and_align(shifted, src=audio_name, aggressive=False)
                 eprint(f"[+s] +{len(added)} T={len(aligner.results)}/{len(sentences)}")
                 next_idx_msg = f"{aligner.sent_idx}/{len(sentences)}" if sentences else "0/0"
                 eprint(f"[idx] next_sentence={next_idx_msg} chunk_limit={chunk_end if chunk_end is not None else '-'}")
-                save_progress_json(out_path, aligner.results, meta, sentences)
+                _save_progress_debounced()
 
                 # ??????: ???? ??????????? ?? ??????? ? ??????? ????? ? ?????? ? ?????????.
                 used_fallback = False
@@ -2851,39 +3705,39 @@ def main():
                     reached_chunk_end = (chunk_end is not None and aligner.sent_idx >= chunk_end)
                     if reached_chunk_end:
                         break
-                    last_end_ms = _last_end_ms_for_file(aligner.results, a.path.name, file_start_ms)
+                    last_end_ms = results_tally.last_end_ms_for_file(aligner.results, audio_name, file_start_ms)
                     still_in_this_file = (last_end_ms + MARGIN_MS) < last_word_end_ms
                     expected_more_in_chunk = (chunk_end is not None and aligner.sent_idx < chunk_end)
                     progressed = (aligner.sent_idx > prev_sent_idx)
                     if not progressed:
                         if expected_more_in_chunk:
-                            if _recover_with_anchor(aligner, sentences, chunk_end, a.path.name, file_start_ms, file_end_ms):
+                            if _recover_with_anchor(aligner, results_tally, sentences, chunk_end, audio_name, file_start_ms, file_end_ms):
                                 used_fallback = True
                                 prev_sent_idx = max(-1, aligner.sent_idx - 1)
                                 continue
-                            if _approximate_missing_chunk(aligner, sentences, chunk_end, a.path.name, file_start_ms, file_end_ms):
+                            if _approximate_missing_chunk(aligner, results_tally, sentences, chunk_end, audio_name, file_start_ms, file_end_ms):
                                 used_fallback = True
                                 break
                         if expected_more_in_chunk and still_in_this_file:
-                            _fail_alignment_and_exit(out_path, aligner, sentences, meta, a.path.name, idx)
+                            _fail_alignment_and_exit(out_path, aligner, sentences, meta, audio_name, idx)
                         if expected_more_in_chunk and not still_in_this_file:
-                            eprint(f"[warn] chunk underflow in {a.path.name}: expected < {chunk_end}, got {aligner.sent_idx}")
+                            eprint(f"[warn] chunk underflow in {audio_name}: expected < {chunk_end}, got {aligner.sent_idx}")
                         break
                     if not still_in_this_file:
                         if expected_more_in_chunk:
                             if not used_fallback:
-                                if _recover_with_anchor(aligner, sentences, chunk_end, a.path.name, file_start_ms, file_end_ms):
+                                if _recover_with_anchor(aligner, results_tally, sentences, chunk_end, audio_name, file_start_ms, file_end_ms):
                                     used_fallback = True
                                     prev_sent_idx = max(-1, aligner.sent_idx - 1)
                                     continue
-                                _approximate_missing_chunk(aligner, sentences, chunk_end, a.path.name, file_start_ms, file_end_ms)
+                                _approximate_missing_chunk(aligner, results_tally, sentences, chunk_end, audio_name, file_start_ms, file_end_ms)
                                 used_fallback = True
-                            eprint(f"[warn] chunk underflow in {a.path.name}: expected < {chunk_end}, got {aligner.sent_idx}")
+                            eprint(f"[warn] chunk underflow in {audio_name}: expected < {chunk_end}, got {aligner.sent_idx}")
                         break
-                    eprint(f"[advance] file={a.path.name} -> idx={aligner.sent_idx}/{len(sentences)}")
+                    eprint(f"[advance] file={audio_name} -> idx={aligner.sent_idx}/{len(sentences)}")
                     prev_sent_idx = aligner.sent_idx
                     _ = aligner.extend_words_and_align([], src=None, aggressive=False)
-                    save_progress_json(out_path, aligner.results, meta, sentences)
+                    _save_progress_debounced()
 
                 _ = aligner.extend_words_and_align([], src=None, aggressive=False)
 
@@ -2893,15 +3747,16 @@ def main():
 
                 running_offset += real_dur
                 meta["progress"]["audios_done"] = idx
-                meta["progress"]["last_audio"] = a.path.name
+                meta["progress"]["last_audio"] = audio_name
                 meta["progress"]["total_duration_sec"] = running_offset
                 if aligner.sent_idx > file_start_sent_idx:
-                    _record_processed_audio(meta, a.path.name, attempt_time)
+                    _record_processed_audio(meta, audio_name, attempt_time)
                 else:
-                    eprint(f"[warn] no progress in {a.path.name}; not marking as processed")
-                save_progress_json(out_path, aligner.results, meta, sentences)
+                    eprint(f"[warn] no progress in {audio_name}; not marking as processed")
+                # written by the writer thread while the next file is aligned
+                save_progress_json(out_path, aligner.results, meta, sentences, background=True)
                 eprint("[save]")
-                if args.device == "cuda":
+                if args.device == "cuda" and not _KEEP_MODELS:
                     _clear_cuda_cache()
 
 
@@ -2911,32 +3766,40 @@ def main():
 
         # Всё найдено
         _sync_progress_meta(meta, aligner.results, sentences, status="success")
-        save_progress_json(out_path, aligner.results, meta, sentences)
+        save_progress_json(out_path, aligner.results, meta, sentences, final=True)
         eprint("[done]")
         finish(True)
 
     except KeyboardInterrupt:
         eprint("[int] saving…")
+        try:
+            _wait_pending_write()  # drain on its own, so the final save below still runs
+        except Exception:
+            pass
         try:
             out_path = Path(args.outFilePath) if args.outFilePath else _build_output_path(
                 args.mainFolderPath, args.channelName, args.videoFolderName
             )
             if 'meta' in locals() and 'aligner' in locals() and 'sentences' in locals():
                 _sync_progress_meta(meta, aligner.results, sentences, status="error")
-                save_progress_json(out_path, aligner.results, meta, sentences)
+                save_progress_json(out_path, aligner.results, meta, sentences, final=True)
                 eprint("[saved]")
         except Exception:
             pass
         finish(False)
     except Exception as e:
         eprint(f"[fatal] {e}")
+        try:
+            _wait_pending_write()  # drain on its own, so the final save below still runs
+        except Exception:
+            pass
         try:
             out_path = Path(args.outFilePath) if args.outFilePath else _build_output_path(
                 args.mainFolderPath, args.channelName, args.videoFolderName
             )
             if 'meta' in locals() and 'aligner' in locals() and 'sentences' in locals():
                 _sync_progress_meta(meta, aligner.results, sentences, status="error")
-                save_progress_json(out_path, aligner.results, meta, sentences)
+                save_progress_json(out_path, aligner.results, meta, sentences, final=True)
         except Exception:
             pass
         finish(False)